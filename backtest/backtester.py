@@ -1,15 +1,68 @@
 # backtester.py
 import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pacsv
 from datamodel import TradingState, OrderDepth, Listing, Trade
 from trader import Trader
 from typing import Dict, List
 import numpy as np
+from numba import njit
+
+# Declared up front so the parser can skip type inference
+COLUMN_TYPES = {
+    'day': pa.int32(),
+    'timestamp': pa.int64(),
+    'product': pa.string(),
+    'mid_price': pa.float64(),
+    'profit_and_loss': pa.float64(),
+    # Book prices and volumes are whole numbers; missing levels stay null
+    **{f'{side}_{field}_{i}': pa.int32()
+       for side in ['bid', 'ask']
+       for field in ['price', 'volume']
+       for i in [1, 2, 3]}
+}
+
+
+@njit(cache=True)
+def fill_order(price, quantity, ask_px, ask_vol, bid_px, bid_vol):
+    """Fill one order against the top of book; a price of 0 marks an empty side.
+
+    Returns the fill price and signed fill quantity (0 when unfilled).
+    """
+    if quantity > 0:  # Buy order
+        if ask_px > 0 and price >= ask_px:
+            return ask_px, min(quantity, ask_vol)
+    elif bid_px > 0 and price <= bid_px:  # Sell order
+        return bid_px, -min(-quantity, bid_vol)
+    return 0, 0
+
+
+@njit(cache=True)
+def match_orders(order_px, order_qty, ask_px, ask_vol, bid_px, bid_vol):
+    """Match a tick's orders against the top of book they were sent into.
+
+    All arguments are aligned per order; a price of 0 marks an empty side.
+    Returns the fill price and signed fill quantity (0 when unfilled).
+    """
+    n = order_px.shape[0]
+    fill_px = np.zeros(n, dtype=np.int64)
+    fill_qty = np.zeros(n, dtype=np.int64)
+    for i in range(n):
+        fill_px[i], fill_qty[i] = fill_order(
+            order_px[i], order_qty[i], ask_px[i], ask_vol[i], bid_px[i], bid_vol[i])
+    return fill_px, fill_qty
 
 
 class Backtester:
     def __init__(self, data_path):
-        # Read CSV with semicolon delimiter
-        self.data = pd.read_csv(data_path, delimiter=';')
+        # Read CSV with semicolon delimiter using Arrow's multithreaded C++ parser
+        table = pacsv.read_csv(
+            data_path,
+            parse_options=pacsv.ParseOptions(delimiter=';'),
+            convert_options=pacsv.ConvertOptions(column_types=COLUMN_TYPES)
+        )
+        # Nullable Int32 keeps sparse book levels at 4 bytes instead of float64
+        self.data = table.to_pandas(types_mapper={pa.int32(): pd.Int32Dtype()}.get)
 
         # Validate required columns
         required_columns = [
@@ -21,10 +74,28 @@ class Backtester:
         self._validate_columns(required_columns)
 
         self.trader = Trader()
-        self.results = []
+        self.results = None
         self.current_positions = {'RAINFOREST_RESIN': 0, 'KELP': 0}
         self.pnl = 0
-        self.trade_history = []
+
+        # Trade history is stored column-wise, one pre-sized array per field
+        self.products = list(self.data['product'].unique())
+        self.product_ids = {p: i for i, p in enumerate(self.products)}
+
+        # The product set is fixed, so listings are built once and shared by
+        # every tick; there are no historical trades, so the trade maps hold
+        # empty tuples that a Trader cannot accidentally append to
+        self.static_listings = {
+            p: Listing(symbol=p, product=p, denomination=p) for p in self.products
+        }
+        self.no_trades = {'RAINFOREST_RESIN': (), 'KELP': ()}
+        capacity = max(len(self.data), 1)
+        self.n_trades = 0
+        self.trade_ts = np.empty(capacity, dtype=np.int64)
+        self.trade_px = np.empty(capacity, dtype=np.int32)
+        self.trade_qty = np.empty(capacity, dtype=np.int32)
+        self.trade_side = np.empty(capacity, dtype=np.int8)
+        self.trade_prod = np.empty(capacity, dtype=np.int8)
 
     def _validate_columns(self, required_cols):
         missing = [col for col in required_cols if col not in self.data.columns]
@@ -33,61 +104,73 @@ class Backtester:
                 f"CSV missing required columns: {', '.join(missing)}")
 
     def run_backtest(self):
-        grouped = self.data.groupby('timestamp')
-
-        for timestamp, group in grouped:
-            # Initialize market data collection
-            market_data = {
-                'timestamp': timestamp,
-                'pnl': self.pnl,
-                'total_volume': 0
-            }
-
-            # 1. Create Listings and Order Depths
-            listings = {}
+        # Pivot once into (tick, product[, level]) matrices; the tick loop
+        # then only indexes into them
+        ticks, tick_idx = np.unique(self.data['timestamp'].to_numpy(), return_inverse=True)
+        prod_idx = self.data['product'].map(self.product_ids).to_numpy()
+        n_ticks, n_products = len(ticks), len(self.products)
+
+        def pivot(values, fill):
+            wide = np.full((n_ticks, n_products) + values.shape[1:], fill, dtype=values.dtype)
+            wide[tick_idx, prod_idx] = values
+            return wide
+
+        bid_px, bid_vol, bid_ok = self._extract_levels(self.data, 'bid')
+        ask_px, ask_vol, ask_ok = self._extract_levels(self.data, 'ask')
+        best_bid, best_bid_vol = self._best_level(bid_px, bid_vol, bid_ok, np.argmax)
+        best_ask, best_ask_vol = self._best_level(ask_px, ask_vol, ask_ok, np.argmin)
+
+        present = pivot(np.ones(len(self.data), dtype=bool), False).tolist()
+        bids = [pivot(a, 0).tolist() for a in (bid_px, bid_vol, bid_ok)]
+        asks = [pivot(a, 0).tolist() for a in (ask_px, ask_vol, ask_ok)]
+        # Top of book per (tick, product); price 0 marks an empty side
+        tops_wide = np.stack([pivot(best_ask, 0), pivot(best_ask_vol, 0),
+                              pivot(best_bid, 0), pivot(best_bid_vol, 0)], axis=-1).tolist()
+
+        # Market data columns come straight out of the pivoted matrices
+        results = {
+            'timestamp': ticks,
+            'pnl': np.zeros(n_ticks),
+            'total_volume': np.zeros(n_ticks, dtype=np.int64)
+        }
+        mid_wide = pivot(self.data['mid_price'].to_numpy(dtype=np.float64), np.nan)
+        bid_wide = pivot(np.where(best_bid > 0, best_bid, np.nan), np.nan)
+        ask_wide = pivot(np.where(best_ask > 0, best_ask, np.nan), np.nan)
+        for p, product in enumerate(self.products):
+            results[f'{product}_mid'] = mid_wide[:, p]
+            results[f'{product}_best_bid'] = bid_wide[:, p]
+            results[f'{product}_best_ask'] = ask_wide[:, p]
+        for product in ['RAINFOREST_RESIN', 'KELP']:
+            results[f'{product}_position'] = np.zeros(n_ticks, dtype=np.int64)
+
+        for tick, timestamp in enumerate(ticks.tolist()):
+            results['pnl'][tick] = self.pnl
+
+            # 1. Create Order Depths
             order_depths = {}
+            tops = {}
 
-            for _, row in group.iterrows():
-                product = row['product']
+            for p, product in enumerate(self.products):
+                if not present[tick][p]:
+                    continue
 
                 # Build OrderDepth from all available levels
                 order_depth = OrderDepth()
-
-                # Process bids (levels 1-3)
-                for i in [1, 2, 3]:
-                    bid_price = row.get(f'bid_price_{i}')
-                    bid_vol = row.get(f'bid_volume_{i}')
-                    if pd.notna(bid_price) and pd.notna(bid_vol):
-                        order_depth.buy_orders[int(bid_price)] = int(bid_vol)
-
-                # Process asks (levels 1-3)
-                for i in [1, 2, 3]:
-                    ask_price = row.get(f'ask_price_{i}')
-                    ask_vol = row.get(f'ask_volume_{i}')
-                    if pd.notna(ask_price) and pd.notna(ask_vol):
-                        order_depth.sell_orders[int(ask_price)] = int(ask_vol)
+                order_depth.buy_orders = self._levels_to_dict(
+                    bids[0][tick][p], bids[1][tick][p], bids[2][tick][p])
+                order_depth.sell_orders = self._levels_to_dict(
+                    asks[0][tick][p], asks[1][tick][p], asks[2][tick][p])
 
                 order_depths[product] = order_depth
-                listings[product] = Listing(
-                    symbol=product,
-                    product=product,
-                    denomination=product
-                )
-
-                # Store market data
-                market_data[f'{product}_mid'] = row['mid_price']
-                market_data[f'{product}_best_bid'] = max(
-                    order_depth.buy_orders.keys(), default=np.nan)
-                market_data[f'{product}_best_ask'] = min(
-                    order_depth.sell_orders.keys(), default=np.nan)
+                tops[product] = tuple(tops_wide[tick][p])
 
             # 2. Create TradingState
             state = TradingState(
-                timestamp=int(timestamp),
-                listings=listings,
+                timestamp=timestamp,
+                listings=self.static_listings,
                 order_depths=order_depths,
-                own_trades={'RAINFOREST_RESIN': [], 'KELP': []},
-                market_trades={'RAINFOREST_RESIN': [], 'KELP': []},
+                own_trades=self.no_trades,
+                market_trades=self.no_trades,
                 position=self.current_positions.copy(),
                 observations={}
             )
@@ -96,50 +179,119 @@ class Backtester:
             result = self.trader.run(state)[0]
 
             # 4. Process orders with historical execution
-            for product in result:
-                for order in result[product]:
-                    self._process_order(
-                        product=product,
-                        order=order,
-                        order_depth=order_depths[product],
-                        timestamp=timestamp
-                    )
+            self._process_orders(result, tops, timestamp)
 
             # 5. Update results
-            market_data.update({
-                'RAINFOREST_RESIN_position': self.current_positions['RAINFOREST_RESIN'],
-                'KELP_position': self.current_positions['KELP'],
-                'total_volume': sum(t['quantity'] for t in self.trade_history[-10:])
-            })
-            self.results.append(market_data)
-
-        return pd.DataFrame(self.results)
-
-    def _process_order(self, product, order, order_depth, timestamp):
-        """Execute orders against historical order book"""
-        if order.quantity > 0:  # Buy order
-            best_ask = min(order_depth.sell_orders.keys())
-            if order.price >= best_ask:
-                fill_qty = min(
-                    order.quantity, order_depth.sell_orders[best_ask])
-                self._record_trade(product, best_ask,
-                                   fill_qty, 'buy', timestamp)
-        else:  # Sell order
-            best_bid = max(order_depth.buy_orders.keys())
-            if order.price <= best_bid:
-                fill_qty = min(abs(order.quantity),
-                               order_depth.buy_orders[best_bid])
-                self._record_trade(product, best_bid,
-                                   fill_qty, 'sell', timestamp)
+            results['RAINFOREST_RESIN_position'][tick] = self.current_positions['RAINFOREST_RESIN']
+            results['KELP_position'][tick] = self.current_positions['KELP']
+            results['total_volume'][tick] = self.trade_qty[
+                max(self.n_trades - 10, 0):self.n_trades].sum()
+
+        self.results = pd.DataFrame(results)
+        return self.results
+
+    @property
+    def trade_history(self):
+        """Executed trades as the list of dicts the backtester used to append per fill"""
+        n = self.n_trades
+        return [{'timestamp': ts, 'product': self.products[prod], 'price': px, 'quantity': qty,
+                 'side': 'buy' if side > 0 else 'sell'}
+                for ts, prod, px, qty, side in zip(self.trade_ts[:n].tolist(), self.trade_prod[:n].tolist(),
+                                                   self.trade_px[:n].tolist(), self.trade_qty[:n].tolist(),
+                                                   self.trade_side[:n].tolist())]
+
+    def trade_history_frame(self):
+        """Build the executed trades DataFrame from the columnar buffers"""
+        n = self.n_trades
+        return pd.DataFrame({
+            'timestamp': self.trade_ts[:n],
+            'product': np.array(self.products, dtype=object)[self.trade_prod[:n]],
+            'price': self.trade_px[:n],
+            'quantity': self.trade_qty[:n],
+            'side': np.where(self.trade_side[:n] > 0, 'buy', 'sell')
+        })
+
+    def _extract_levels(self, data, side):
+        """Pull the price/volume columns of one book side out as (rows, levels) arrays"""
+        levels = [i for i in [1, 2, 3]
+                  if f'{side}_price_{i}' in data.columns
+                  and f'{side}_volume_{i}' in data.columns]
+        prices = data[[f'{side}_price_{i}' for i in levels]].to_numpy(
+            dtype=np.float64, na_value=np.nan)
+        volumes = data[[f'{side}_volume_{i}' for i in levels]].to_numpy(
+            dtype=np.float64, na_value=np.nan)
+
+        # A level only counts when both its price and volume are present
+        valid = ~(np.isnan(prices) | np.isnan(volumes))
+        prices = np.where(valid, prices, 0).astype(np.int32)
+        volumes = np.where(valid, volumes, 0).astype(np.int32)
+        return prices, volumes, valid
+
+    def _best_level(self, prices, volumes, valid, pick):
+        """Best price and its volume per row, 0 where the side is empty"""
+        fill = np.iinfo(np.int32).min if pick is np.argmax else np.iinfo(np.int32).max
+        idx = pick(np.where(valid, prices, fill), axis=1)
+        rows = np.arange(len(prices))
+        has_level = valid.any(axis=1)
+        return (np.where(has_level, prices[rows, idx], 0),
+                np.where(has_level, volumes[rows, idx], 0))
+
+    def _levels_to_dict(self, prices, volumes, valid):
+        return {price: volume for price, volume, ok
+                in zip(prices, volumes, valid) if ok}
+
+    def _process_orders(self, result, tops, timestamp):
+        """Execute a tick's orders against the cached top of book"""
+        products, order_px, order_qty = [], [], []
+        ask_px, ask_vol, bid_px, bid_vol = [], [], [], []
+        for product, orders in result.items():
+            best_ask, best_ask_vol, best_bid, best_bid_vol = tops[product]
+            for order in orders:
+                products.append(product)
+                order_px.append(order.price)
+                order_qty.append(order.quantity)
+                ask_px.append(best_ask)
+                ask_vol.append(best_ask_vol)
+                bid_px.append(best_bid)
+                bid_vol.append(best_bid_vol)
+
+        if not products:
+            return
+
+        fill_px, fill_qty = match_orders(
+            np.array(order_px, dtype=np.float64),
+            np.array(order_qty, dtype=np.int64),
+            np.array(ask_px, dtype=np.int64),
+            np.array(ask_vol, dtype=np.int64),
+            np.array(bid_px, dtype=np.int64),
+            np.array(bid_vol, dtype=np.int64)
+        )
+
+        for product, price, qty in zip(products, fill_px.tolist(), fill_qty.tolist()):
+            if qty > 0:
+                self._record_trade(product, price, qty, 'buy', timestamp)
+            elif qty < 0:
+                self._record_trade(product, price, -qty, 'sell', timestamp)
 
     def _record_trade(self, product, price, quantity, side, timestamp):
         """Update positions and PnL"""
         self.current_positions[product] += quantity if side == 'buy' else -quantity
         self.pnl += quantity * (price * (-1 if side == 'buy' else 1))
-        self.trade_history.append({
-            'timestamp': timestamp,
-            'product': product,
-            'price': price,
-            'quantity': quantity,
-            'side': side
-        })
+
+        if self.n_trades == len(self.trade_ts):
+            self._grow_trade_buffers()
+        n = self.n_trades
+        self.trade_ts[n] = timestamp
+        self.trade_px[n] = price
+        self.trade_qty[n] = quantity
+        self.trade_side[n] = 1 if side == 'buy' else -1
+        self.trade_prod[n] = self.product_ids[product]
+        self.n_trades += 1
+
+    def _grow_trade_buffers(self):
+        capacity = 2 * len(self.trade_ts)
+        self.trade_ts = np.resize(self.trade_ts, capacity)
+        self.trade_px = np.resize(self.trade_px, capacity)
+        self.trade_qty = np.resize(self.trade_qty, capacity)
+        self.trade_side = np.resize(self.trade_side, capacity)
+        self.trade_prod = np.resize(self.trade_prod, capacity)
@@ -9,18 +9,40 @@ from typing import List, Dict
 import numpy as np
 import pandas as pd
 from collections import defaultdict
-import jsonpickle
+from functools import partial
+from concurrent.futures import ThreadPoolExecutor
+import base64
+import json
+import math
+
+# Number of mid prices kept per symbol
+HISTORY_LENGTH = 200
+# Threads used to evaluate per-symbol strategies; 0 runs them inline. The
+# strategies are mostly pure Python and hold the GIL, so this only pays off
+# once they spend their time in GIL-releasing NumPy code
+STRATEGY_WORKERS = 0
 
 class Trader:
     def __init__(self):
         # Persistent memory across ticks
-        self.price_history = defaultdict(list)
+        # Buffers hold twice the history so the live window stays contiguous;
+        # it is copied back to the front only once every HISTORY_LENGTH ticks.
+        # Mids are stored doubled (bid + ask) so they stay exact in int32
+        self.price_history = defaultdict(lambda: np.zeros(2 * HISTORY_LENGTH, dtype=np.int32))
+        self.history_count = defaultdict(int)
+        self.history_end = defaultdict(int)
+        # Running [sum, sum of squares] of doubled mids over each rolling window
+        self.rolling_sums = defaultdict(lambda: [0, 0])
+        self.last_trader_data = None
+        # sym -> (history_end, base64 blob) of the last persisted history tail
+        self.history_blobs = {}
         self.entry_price_map = {}
         self.position_side_map = {}
         self.tick_counter = 0
         self.last_gradient = {}
         self.sunlight_index_history = []
-        self.state_vars_to_persist = ["price_history", "entry_price_map", "position_side_map", "sunlight_index_history"]
+        self.sunlight_window = 10
+        self.state_vars_to_persist = ["entry_price_map", "position_side_map", "sunlight_index_history"]
 
         self.asset_limits = {
             "KELP": 50,
@@ -40,6 +62,30 @@ class Trader:
             "VOLCANIC_ROCK_VOUCHER_10500": 200
         }
 
+        # Rolling window used for each symbol's mean/std signal
+        self.stat_windows = {
+            "KELP": 20,
+            "VOLCANIC_ROCK": 50,
+            "SQUID_INK": 50,
+            "DJEMBES": 15
+        }
+
+        # Strategy per symbol; vouchers are added on first sight with their parsed strike
+        self.dispatch = {
+            "KELP": partial(self.run_bollinger_strategy, std_dev=2.0),
+            "VOLCANIC_ROCK": partial(self.run_bollinger_strategy, std_dev=1.2),
+            "SQUID_INK": self.run_extreme_strategy,
+            "RAINFOREST_RESIN": self.run_resin_market_maker,
+            "DJEMBES": self.run_mean_reversion,
+            "CROISSANTS": self.run_olivia_tracking,
+            "MAGNIFICENT_MACARONS": self.run_sunlight_strategy
+        }
+        self.basket_symbols = {"PICNIC_BASKET1", "PICNIC_BASKET2"}
+        # Per tick (best_bid, bid_vol, best_ask, ask_vol), filled by update_symbol
+        self.book_tops = {}
+        self.strikes = {}
+        self.pool = ThreadPoolExecutor(max_workers=STRATEGY_WORKERS) if STRATEGY_WORKERS else None
+
     def run(self, state: TradingState):
         self.load_state(state.traderData)
         self.tick_counter += 1
@@ -47,108 +93,100 @@ class Trader:
         orders: Dict[str, List[Order]] = {}
         conversions = 0
 
-        self.update_price_history(state)
-
-        for symbol in state.order_depths:
-            if symbol == "KELP":
-                orders[symbol] = self.run_bollinger_strategy(state, symbol, window=20, std_dev=2.0)
-            elif symbol == "VOLCANIC_ROCK":
-                orders[symbol] = self.run_bollinger_strategy(state, symbol, window=50, std_dev=1.2)
-            elif symbol.startswith("VOLCANIC_ROCK_VOUCHER_"):
-                orders[symbol] = self.run_option_strategy(state, symbol)
-            elif symbol == "SQUID_INK":
-                orders[symbol] = self.run_extreme_strategy(state, symbol)
-            elif symbol == "RAINFOREST_RESIN":
-                orders[symbol] = self.run_resin_market_maker(state, symbol)
-            elif symbol in ["PICNIC_BASKET1", "PICNIC_BASKET2"]:
-                pb_orders = self.run_picnic_arbitrage(state)
-                for k, v in pb_orders.items():
-                    orders.setdefault(k, []).extend(v)
-            elif symbol == "DJEMBES":
-                orders[symbol] = self.run_mean_reversion(state, symbol)
-            elif symbol == "CROISSANTS":
-                orders[symbol] = self.run_olivia_tracking(state, symbol)
-            elif symbol == "MAGNIFICENT_MACARONS":
-                orders[symbol] = self.run_sunlight_strategy(state, symbol)
+        # Strategies only read shared state and write their own symbol's
+        # entries, so they can be evaluated independently of each other
+        jobs = []
+        # Single pass over the book: refresh each symbol's top of book and
+        # history, then queue its strategy to run once every symbol is current
+        self.book_tops = {}
+        for symbol, depth in state.order_depths.items():
+            self.update_symbol(symbol, depth)
+            if symbol in self.basket_symbols:
+                continue
+
+            if symbol not in self.dispatch:
+                self.register_symbol(symbol)
+            strategy = self.dispatch[symbol]
+            if strategy is not None:
+                jobs.append((symbol, strategy))
+
+        # The basket arbitrage covers both baskets at once, so it runs once per tick
+        if not self.basket_symbols.isdisjoint(state.order_depths):
+            orders.update(self.run_picnic_arbitrage(state))
+
+        if self.pool:
+            futures = [(symbol, self.pool.submit(strategy, state, symbol)) for symbol, strategy in jobs]
+            for symbol, future in futures:
+                orders[symbol] = future.result()
+        else:
+            for symbol, strategy in jobs:
+                orders[symbol] = strategy(state, symbol)
 
         trader_data = self.save_state()
         return orders, conversions, trader_data
 
     # ----- STRATEGY IMPLEMENTATIONS (each function handles a specific product type) -----
 
-    def run_bollinger_strategy(self, state, symbol, window=20, std_dev=2.0) -> List[Order]:
-        depth = state.order_depths[symbol]
-        if len(self.price_history[symbol]) < window:
+    def run_bollinger_strategy(self, state, symbol, std_dev=2.0) -> List[Order]:
+        if self.history_count[symbol] < self.stat_windows[symbol]:
             return []
 
-        prices = self.price_history[symbol][-window:]
-        mean = np.mean(prices)
-        std = np.std(prices)
+        mean, std = self.rolling_stats(symbol)
         upper, lower = mean + std_dev * std, mean - std_dev * std
         position = state.position.get(symbol, 0)
         limit = self.asset_limits[symbol]
         orders = []
 
-        best_ask = min(depth.sell_orders) if depth.sell_orders else None
-        best_bid = max(depth.buy_orders) if depth.buy_orders else None
+        best_bid, bid_vol, best_ask, ask_vol = self.book_tops[symbol]
 
         if best_ask and best_ask < lower and position < limit:
-            qty = min(abs(depth.sell_orders[best_ask]), limit - position)
+            qty = min(abs(ask_vol), limit - position)
             orders.append(Order(symbol, best_ask, qty))
             self.entry_price_map[symbol] = best_ask
 
         if best_bid and best_bid > upper and position > -limit:
-            qty = min(abs(depth.buy_orders[best_bid]), position + limit)
+            qty = min(abs(bid_vol), position + limit)
             orders.append(Order(symbol, best_bid, -qty))
             self.entry_price_map[symbol] = best_bid
 
         return orders
 
     def run_option_strategy(self, state, symbol) -> List[Order]:
-        rock_price = self.price_history["VOLCANIC_ROCK"][-1] if "VOLCANIC_ROCK" in self.price_history and self.price_history["VOLCANIC_ROCK"] else 0
-        try:
-            strike = int(symbol.split("_")[-1])
-        except:
-            return []
+        rock_price = self.last_mid("VOLCANIC_ROCK") if self.history_count["VOLCANIC_ROCK"] else 0
+        strike = self.strikes[symbol]
 
         intrinsic = max(rock_price - strike, 0)
-        depth = state.order_depths[symbol]
-        best_bid = max(depth.buy_orders) if depth.buy_orders else None
-        best_ask = min(depth.sell_orders) if depth.sell_orders else None
+        best_bid, bid_vol, best_ask, ask_vol = self.book_tops[symbol]
         position = state.position.get(symbol, 0)
         limit = self.asset_limits[symbol]
         orders = []
 
         if best_ask and intrinsic >= best_ask and position < limit:
-            qty = min(abs(depth.sell_orders[best_ask]), limit - position)
+            qty = min(abs(ask_vol), limit - position)
             orders.append(Order(symbol, best_ask, qty))
         elif best_bid and intrinsic <= best_bid and position > -limit:
-            qty = min(abs(depth.buy_orders[best_bid]), position + limit)
+            qty = min(abs(bid_vol), position + limit)
             orders.append(Order(symbol, best_bid, -qty))
 
         return orders
 
     def run_extreme_strategy(self, state, symbol) -> List[Order]:
-        if len(self.price_history[symbol]) < 50:
+        if self.history_count[symbol] < self.stat_windows[symbol]:
             return []
-        recent_prices = self.price_history[symbol][-50:]
-        mean = np.mean(recent_prices)
-        current = recent_prices[-1]
+        mean, std = self.rolling_stats(symbol)
+        current = self.last_mid(symbol)
         deviation = current - mean
-        std = np.std(recent_prices)
         threshold = 2 * std
         orders = []
-        depth = state.order_depths[symbol]
+        best_bid, bid_vol, best_ask, ask_vol = self.book_tops[symbol]
         position = state.position.get(symbol, 0)
         limit = self.asset_limits[symbol]
 
-        if deviation > threshold and position > -limit:
-            best_bid = max(depth.buy_orders)
-            qty = min(abs(depth.buy_orders[best_bid]), position + limit)
+        if deviation > threshold and best_bid is not None and position > -limit:
+            qty = min(abs(bid_vol), position + limit)
             orders.append(Order(symbol, best_bid, -qty))
-        elif deviation < -threshold and position < limit:
-            best_ask = min(depth.sell_orders)
-            qty = min(abs(depth.sell_orders[best_ask]), limit - position)
+        elif deviation < -threshold and best_ask is not None and position < limit:
+            qty = min(abs(ask_vol), limit - position)
             orders.append(Order(symbol, best_ask, qty))
 
         return orders
@@ -168,42 +206,37 @@ class Trader:
         return orders
 
     def run_picnic_arbitrage(self, state) -> Dict[str, List[Order]]:
-        def get_mid(sym):
-            d = state.order_depths[sym]
-            return (max(d.buy_orders) + min(d.sell_orders)) / 2 if d.buy_orders and d.sell_orders else None
-
-        mids = {s: get_mid(s) for s in ["CROISSANTS", "JAMS", "DJEMBES", "PICNIC_BASKET1", "PICNIC_BASKET2"]}
         orders = defaultdict(list)
+        tops = [self.book_tops.get(s) for s in ("CROISSANTS", "JAMS", "DJEMBES", "PICNIC_BASKET1", "PICNIC_BASKET2")]
+        if any(top is None or top[0] is None or top[2] is None for top in tops):
+            return orders
+        croissants, jams, djembes, pb1, pb2 = [(top[0] + top[2]) / 2 for top in tops]
 
-        pb1_fair = 6 * mids["CROISSANTS"] + 3 * mids["JAMS"] + mids["DJEMBES"]
-        pb2_fair = 4 * mids["CROISSANTS"] + 2 * mids["JAMS"]
-        diff1 = mids["PICNIC_BASKET1"] - pb1_fair
-        diff2 = mids["PICNIC_BASKET2"] - pb2_fair
+        diff1 = pb1 - (6 * croissants + 3 * jams + djembes)
+        diff2 = pb2 - (4 * croissants + 2 * jams)
         threshold = 30
 
         if diff1 > threshold:
-            best_bid = max(state.order_depths["PICNIC_BASKET1"].buy_orders)
+            best_bid = self.book_tops["PICNIC_BASKET1"][0]
             orders["PICNIC_BASKET1"].append(Order("PICNIC_BASKET1", best_bid, -2))
         elif diff1 < -threshold:
-            best_ask = min(state.order_depths["PICNIC_BASKET1"].sell_orders)
+            best_ask = self.book_tops["PICNIC_BASKET1"][2]
             orders["PICNIC_BASKET1"].append(Order("PICNIC_BASKET1", best_ask, 2))
 
         if diff2 > threshold:
-            best_bid = max(state.order_depths["PICNIC_BASKET2"].buy_orders)
+            best_bid = self.book_tops["PICNIC_BASKET2"][0]
             orders["PICNIC_BASKET2"].append(Order("PICNIC_BASKET2", best_bid, -2))
         elif diff2 < -threshold:
-            best_ask = min(state.order_depths["PICNIC_BASKET2"].sell_orders)
+            best_ask = self.book_tops["PICNIC_BASKET2"][2]
             orders["PICNIC_BASKET2"].append(Order("PICNIC_BASKET2", best_ask, 2))
 
         return orders
 
     def run_mean_reversion(self, state, symbol) -> List[Order]:
-        prices = self.price_history[symbol]
-        if len(prices) < 15:
+        if self.history_count[symbol] < self.stat_windows[symbol]:
             return []
 
-        mean = np.mean(prices[-15:])
-        std = np.std(prices[-15:])
+        mean, std = self.rolling_stats(symbol)
         spread = 0.8 * std
         orders = []
         depth = state.order_depths[symbol]
@@ -224,58 +257,144 @@ class Trader:
         orders = []
         position = state.position.get(symbol, 0)
         limit = self.asset_limits[symbol]
-        depth = state.order_depths[symbol]
-        best_bid = max(depth.buy_orders)
-        best_ask = min(depth.sell_orders)
+        best_bid, _, best_ask, _ = self.book_tops[symbol]
 
         for t in olivia_trades:
+            # An empty side skips the order without falling through to the other branch
             if t.buyer == "Olivia" and position < limit:
-                orders.append(Order(symbol, best_ask, 10))
+                if best_ask is not None:
+                    orders.append(Order(symbol, best_ask, 10))
             elif t.seller == "Olivia" and position > -limit:
-                orders.append(Order(symbol, best_bid, -10))
+                if best_bid is not None:
+                    orders.append(Order(symbol, best_bid, -10))
         return orders
 
     def run_sunlight_strategy(self, state, symbol) -> List[Order]:
         obs = state.observations.conversionObservations[symbol]
-        self.sunlight_index_history.append(obs.sunlightIndex)
-        if len(self.sunlight_index_history) < 10:
+        history = self.sunlight_index_history
+        history.append(obs.sunlightIndex)
+        # Only the newest sample and the one leaving the window matter
+        if len(history) > self.sunlight_window + 1:
+            del history[0]
+        if len(history) <= self.sunlight_window:
             return []
-        smooth = np.convolve(self.sunlight_index_history, np.ones(10)/10, mode='valid')
-        gradient = np.gradient(smooth)[-1]
+        # Slope of the 10-tick SMA: consecutive means differ by (x_t - x_{t-10}) / 10
+        gradient = (history[-1] - history[0]) / self.sunlight_window
         threshold = 0.01
         orders = []
-        depth = state.order_depths[symbol]
+        best_bid, _, best_ask, _ = self.book_tops[symbol]
         position = state.position.get(symbol, 0)
         limit = self.asset_limits[symbol]
 
-        if gradient > threshold and position < limit:
-            best_ask = min(depth.sell_orders)
+        if gradient > threshold and best_ask is not None and position < limit:
             orders.append(Order(symbol, best_ask, 10))
-        elif gradient < -threshold and position > -limit:
-            best_bid = max(depth.buy_orders)
+        elif gradient < -threshold and best_bid is not None and position > -limit:
             orders.append(Order(symbol, best_bid, -10))
         return orders
 
     # ---- UTILS ----
-    def update_price_history(self, state: TradingState):
-        for sym, od in state.order_depths.items():
-            if od.buy_orders and od.sell_orders:
-                self.price_history[sym].append((max(od.buy_orders) + min(od.sell_orders)) / 2)
-                self.price_history[sym] = self.price_history[sym][-200:]
+    def register_symbol(self, symbol):
+        """Resolve the strategy for a symbol not in the dispatch table (None if untraded)"""
+        self.dispatch[symbol] = None
+        if symbol.startswith("VOLCANIC_ROCK_VOUCHER_"):
+            try:
+                self.strikes[symbol] = int(symbol.rsplit("_", 1)[1])
+            except ValueError:
+                return
+            self.dispatch[symbol] = self.run_option_strategy
+
+    def update_symbol(self, sym, od: OrderDepth):
+        """Cache the symbol's top of book and record its mid price"""
+        best_bid = max(od.buy_orders) if od.buy_orders else None
+        best_ask = min(od.sell_orders) if od.sell_orders else None
+        self.book_tops[sym] = (
+            best_bid, od.buy_orders[best_bid] if best_bid is not None else 0,
+            best_ask, od.sell_orders[best_ask] if best_ask is not None else 0
+        )
+
+        if best_bid is not None and best_ask is not None:
+            buf = self.price_history[sym]
+            count = self.history_count[sym]
+            end = self.history_end[sym]
+            mid2 = best_bid + best_ask
+
+            window = self.stat_windows.get(sym)
+            if window:
+                sums = self.rolling_sums[sym]
+                if count >= window:
+                    old = int(buf[end - window])
+                    sums[0] -= old
+                    sums[1] -= old * old
+                sums[0] += mid2
+                sums[1] += mid2 * mid2
+
+            if end == len(buf):
+                buf[:HISTORY_LENGTH] = buf[HISTORY_LENGTH:]
+                end = HISTORY_LENGTH
+            buf[end] = mid2
+            self.history_end[sym] = end + 1
+            self.history_count[sym] = min(count + 1, HISTORY_LENGTH)
+
+    def recent_prices(self, symbol, n) -> np.ndarray:
+        """View of the last n recorded doubled mids, bid + ask (fewer during warm-up)"""
+        end = self.history_end[symbol]
+        return self.price_history[symbol][end - min(n, self.history_count[symbol]):end]
+
+    def last_mid(self, symbol) -> float:
+        return int(self.price_history[symbol][self.history_end[symbol] - 1]) / 2
+
+    def rolling_stats(self, symbol):
+        """O(1) population mean and std of mid prices over the symbol's rolling window"""
+        n = min(self.history_count[symbol], self.stat_windows[symbol])
+        total, total_sq = self.rolling_sums[symbol]
+        # Integer sums keep the variance exact; halve back to mid-price units
+        return total / (2 * n), math.sqrt(n * total_sq - total * total) / (2 * n)
+
+    def reset_rolling_sums(self, symbol):
+        window = self.stat_windows.get(symbol)
+        if window:
+            prices = self.recent_prices(symbol, window).astype(np.int64)
+            self.rolling_sums[symbol] = [int(prices.sum()), int(np.dot(prices, prices))]
 
     def load_state(self, trader_data: str):
-        if trader_data:
+        # Memory already matches what we emitted last tick; skip the decode
+        if trader_data and trader_data != self.last_trader_data:
             try:
-                data = jsonpickle.decode(trader_data)
+                data = json.loads(trader_data)
+                self.history_blobs.clear()
                 for k in self.state_vars_to_persist:
                     if k in data:
                         setattr(self, k, data[k])
+                for sym, blob in data.get("price_history", {}).items():
+                    prices = np.frombuffer(base64.b64decode(blob), dtype=np.int32)
+                    self.price_history[sym][:len(prices)] = prices
+                    self.history_count[sym] = len(prices)
+                    self.history_end[sym] = len(prices)
+                    self.reset_rolling_sums(sym)
             except Exception as e:
                 print("Failed to load state:", e)
 
+    def history_blob(self, sym) -> str:
+        """Encoded tail of a symbol's history, re-encoded only when it has moved.
+
+        Only the samples a strategy can read (its stat window, or the last
+        mid) are persisted, which is all a fresh process needs to resume.
+        """
+        end = self.history_end[sym]
+        cached = self.history_blobs.get(sym)
+        if cached is None or cached[0] != end:
+            tail = self.recent_prices(sym, self.stat_windows.get(sym, 1))
+            cached = (end, base64.b64encode(tail.tobytes()).decode("ascii"))
+            self.history_blobs[sym] = cached
+        return cached[1]
+
     def save_state(self) -> str:
         try:
-            return jsonpickle.encode({k: getattr(self, k) for k in self.state_vars_to_persist})
+            data = {k: getattr(self, k) for k in self.state_vars_to_persist}
+            # Raw int32 bytes are far cheaper to encode than a list of numbers
+            data["price_history"] = {sym: self.history_blob(sym) for sym in self.price_history}
+            self.last_trader_data = json.dumps(data, separators=(",", ":"))
+            return self.last_trader_data
         except Exception as e:
             print("Failed to save state:", e)
             return ""
@@ -1,7 +1,9 @@
 import json
-import statistics
+from collections import deque
 from typing import Any
 
+import numpy as np
+
 from datamodel import Order, OrderDepth, TradingState, Symbol, ProsperityEncoder
 
 
@@ -14,31 +16,29 @@ class Logger:
         self.logs += sep.join(map(str, objects)) + end
 
     def flush(self, state: TradingState, orders: dict[Symbol, list[Order]], conversions: int, trader_data: str) -> None:
-        base_length = len(
-            self.to_json(
-                [
-                    self.compress_state(state, ""),
-                    self.compress_orders(orders),
-                    conversions,
-                    "",
-                    "",
-                ]
-            )
+        # Serialize once with empty placeholders; the three variable-length
+        # strings are then spliced in instead of dumping the whole payload twice
+        base = self.to_json(
+            [
+                self.compress_state(state, ""),
+                self.compress_orders(orders),
+                conversions,
+                "",
+                "",
+            ]
         )
+        base_length = len(base)
 
         max_item_length = (self.max_log_length - base_length) // 3
 
+        head = "[[" + str(state.timestamp) + ","
         print(
-            self.to_json(
-                [
-                    self.compress_state(state, self.truncate(
-                        state.traderData, max_item_length)),
-                    self.compress_orders(orders),
-                    conversions,
-                    self.truncate(trader_data, max_item_length),
-                    self.truncate(self.logs, max_item_length),
-                ]
-            )
+            head
+            + self.to_json(self.truncate(state.traderData, max_item_length))
+            + base[len(head) + 2:-7]
+            + "," + self.to_json(self.truncate(trader_data, max_item_length))
+            + "," + self.to_json(self.truncate(self.logs, max_item_length))
+            + "]"
         )
 
         self.logs = ""
@@ -79,51 +79,85 @@ class Logger:
 logger = Logger()
 
 
+def ask_above(sell_orders, best_ask, threshold):
+    """Lowest ask above threshold; the best ask already qualifies in the common case"""
+    if best_ask > threshold:
+        return best_ask
+    return min((p for p in sell_orders if p > threshold), default=None)
+
+
+def bid_below(buy_orders, best_bid, threshold):
+    """Highest bid below threshold; the best bid already qualifies in the common case"""
+    if best_bid < threshold:
+        return best_bid
+    return max((p for p in buy_orders if p < threshold), default=None)
+
+
+def push_price(buf, n, price):
+    """Append price after the first n slots of buf, sliding the newest half to the front when full"""
+    if n == len(buf):
+        half = len(buf) // 2
+        buf[:half] = buf[half:]
+        n = half
+    buf[n] = price
+    return n + 1
+
+
 class Trader:
     def __init__(self):
-        self.price_data = {"KELP": [], "SQUID_INK": []}
-        self.vwap_data = {"KELP": [], "SQUID_INK": []}
+        # Mids per product in a linear-write buffer that slides back to the newest 40 when full
+        self.price_data = {"KELP": np.empty(80), "SQUID_INK": np.empty(80)}
+        self.price_counts = {"KELP": 0, "SQUID_INK": 0}
+        # Per-product VWAP window stored column-wise, with running
+        # [sum(vwap * vol), sum(vol)] so the fair value needs no re-summing
+        self.vwap_vals = {"KELP": deque(), "SQUID_INK": deque()}
+        self.vwap_vols = {"KELP": deque(), "SQUID_INK": deque()}
+        self.vwap_sums = {"KELP": [0, 0], "SQUID_INK": [0, 0]}
         self.tick = 0
 
     def vwap_strategy(self, product, order_depth, position, position_limit):
         orders = []
+        buy_cap = max(0, position_limit - position)
+        sell_cap = max(0, position + position_limit)
 
         if order_depth.sell_orders and order_depth.buy_orders:
-            best_ask = min(order_depth.sell_orders)
-            best_bid = max(order_depth.buy_orders)
-            ask_vol = -order_depth.sell_orders[best_ask]
-            bid_vol = order_depth.buy_orders[best_bid]
+            best_ask, ask_vol = min(order_depth.sell_orders.items())
+            best_bid, bid_vol = max(order_depth.buy_orders.items())
+            ask_vol = -ask_vol
             mid_price = (best_ask + best_bid) / 2
 
-            self.price_data[product].append(mid_price)
-            if len(self.price_data[product]) > 40:
-                self.price_data[product].pop(0)
+            prices = self.price_data[product]
+            n = self.price_counts[product] = push_price(
+                prices, self.price_counts[product], mid_price)
 
-            volatility = statistics.stdev(
-                self.price_data[product][-20:]) if len(self.price_data[product]) >= 20 else 0
+            volatility = float(prices[n - 20:n].std(ddof=1)) if n >= 20 else 0
             vwap_window = 8 if volatility > 4 else 16
 
             total_vol = ask_vol + bid_vol
             current_vwap = (best_bid * ask_vol + best_ask *
                             bid_vol) // total_vol if total_vol else int(mid_price)
-            self.vwap_data[product].append(
-                {"vwap": current_vwap, "vol": total_vol})
-            if len(self.vwap_data[product]) > vwap_window:
-                self.vwap_data[product].pop(0)
-
-            total_weighted = sum(x["vwap"] * x["vol"]
-                                 for x in self.vwap_data[product])
-            total_vol = sum(x["vol"] for x in self.vwap_data[product])
+            vals, vols = self.vwap_vals[product], self.vwap_vols[product]
+            sums = self.vwap_sums[product]
+            vals.append(current_vwap)
+            vols.append(total_vol)
+            sums[0] += current_vwap * total_vol
+            sums[1] += total_vol
+            if len(vals) > vwap_window:
+                old_vwap, old_vol = vals.popleft(), vols.popleft()
+                sums[0] -= old_vwap * old_vol
+                sums[1] -= old_vol
+
+            total_weighted, total_vol = sums
             fair_value = total_weighted // total_vol if total_vol else int(
                 mid_price)
 
             spread = best_ask - best_bid
-            min_edge = max(1, int(spread * 0.3))
-            take_spread = max(2, int(spread * 0.6))
+            min_edge = max(1, spread * 3 // 10)
+            take_spread = max(2, spread * 6 // 10)
 
             # Avoid negative positions
-            buy_qty = max(0, min(ask_vol, position_limit - position))
-            sell_qty = max(0, min(bid_vol, position + position_limit))
+            buy_qty = min(ask_vol, buy_cap)
+            sell_qty = min(bid_vol, sell_cap)
 
             if spread >= take_spread:
                 if fair_value - best_ask >= min_edge and buy_qty > 0:
@@ -131,13 +165,15 @@ class Trader:
                 if best_bid - fair_value >= min_edge and sell_qty > 0:
                     orders.append(Order(product, best_bid, -sell_qty))
 
-            baaf = min([p for p in order_depth.sell_orders if p >
-                       fair_value + 1], default=fair_value + 2)
-            bbbf = max([p for p in order_depth.buy_orders if p <
-                       fair_value - 1], default=fair_value - 2)
+            baaf = ask_above(order_depth.sell_orders, best_ask, fair_value + 1)
+            bbbf = bid_below(order_depth.buy_orders, best_bid, fair_value - 1)
+            if baaf is None:
+                baaf = fair_value + 2
+            if bbbf is None:
+                bbbf = fair_value - 2
 
-            passive_buy_qty = max(0, position_limit - position)
-            passive_sell_qty = max(0, position + position_limit)
+            passive_buy_qty = buy_cap
+            passive_sell_qty = sell_cap
 
             if passive_buy_qty > 0:
                 orders.append(Order(product, bbbf + 1, passive_buy_qty))
@@ -152,16 +188,16 @@ class Trader:
         sell_qty = max(0, position + position_limit)
 
         if order_depth.sell_orders:
-            best_ask = min(order_depth.sell_orders)
+            best_ask, best_ask_vol = min(order_depth.sell_orders.items())
             if best_ask <= fair_value - width and buy_qty > 0:
                 orders.append(Order("RAINFOREST_RESIN", best_ask,
-                              min(-order_depth.sell_orders[best_ask], buy_qty)))
+                              min(-best_ask_vol, buy_qty)))
 
         if order_depth.buy_orders:
-            best_bid = max(order_depth.buy_orders)
+            best_bid, best_bid_vol = max(order_depth.buy_orders.items())
             if best_bid >= fair_value + width and sell_qty > 0:
                 orders.append(Order("RAINFOREST_RESIN", best_bid, -
-                              min(order_depth.buy_orders[best_bid], sell_qty)))
+                              min(best_bid_vol, sell_qty)))
 
         return orders
 
@@ -1,151 +1,249 @@
 from datamodel import OrderDepth, TradingState, Order
 from typing import List
-import jsonpickle
-import statistics
+import json
+import math
+from collections import deque
+
+# traderData is re-encoded on the first tick of a process and every N ticks after
+TRADER_DATA_INTERVAL = 20
+
+# Resin take prices: 10000 -/+ 1.8 rounded inward to whole ticks
+RESIN_BUY_AT = 9998
+RESIN_SELL_AT = 10002
+
+try:
+    from numba import njit
+except ImportError:
+    # Without Numba the *_core functions are plain Python
+    def njit(*args, **kwargs):
+        return lambda fn: fn
+
+
+@njit(cache=True)
+def sample_stdev(total, total_sq, n):
+    """Sample standard deviation from a window's running sum and sum of squares"""
+    return math.sqrt(max(n * total_sq - total * total, 0.0) / (n * (n - 1)))
+
+
+def sorted_book(order_depth):
+    """Asks ascending and bids descending as (price, volume) lists, sorted once per tick"""
+    return (sorted(order_depth.sell_orders.items()),
+            sorted(order_depth.buy_orders.items(), reverse=True))
+
+
+def ask_above(asks, threshold):
+    """Lowest ask above threshold, walking the sorted asks from the best level"""
+    for price, _ in asks:
+        if price > threshold:
+            return price
+    return None
+
+
+def bid_below(bids, threshold):
+    """Highest bid below threshold, walking the sorted bids from the best level"""
+    for price, _ in bids:
+        if price < threshold:
+            return price
+    return None
+
+
+@njit(cache=True)
+def kelp_core(best_ask, best_bid, ask_vol, bid_vol, fair_value, position, position_limit):
+    """Order sizes for KELP: (take ask qty, take bid qty, passive buy qty, passive sell qty)"""
+    buy_cap = position_limit - position
+    sell_cap = position_limit + position
+    spread = best_ask - best_bid
+    min_edge = max(1, spread * 3 // 10)
+    take_spread = max(2, spread * 6 // 10)
+
+    take_ask_qty = 0
+    take_bid_qty = 0
+    if spread >= take_spread:
+        if fair_value - best_ask >= min_edge:
+            take_ask_qty = max(0, min(ask_vol, buy_cap))
+        if best_bid - fair_value >= min_edge:
+            take_bid_qty = max(0, min(bid_vol, sell_cap))
+
+    return take_ask_qty, take_bid_qty, max(0, buy_cap), max(0, sell_cap)
+
+
+@njit(cache=True)
+def squid_core(best_ask, best_bid, ask_vol, bid_vol, total, total_sq, n, width,
+               position, position_limit):
+    """Order sizes for SQUID_INK's band breakout: (take ask qty, take bid qty)"""
+    dispersion = n * total_sq - total * total
+    if dispersion <= 0.0:
+        # A flat window holds the current mid, so neither side of the book can breach a band
+        return 0, 0
+    buy_cap = position_limit - position
+    sell_cap = position_limit + position
+    mean = total / n
+    stdev = math.sqrt(dispersion / (n * (n - 1)))
+    take_ask_qty = 0
+    take_bid_qty = 0
+    if best_ask < mean - width * stdev:
+        take_ask_qty = max(0, min(ask_vol, buy_cap))
+    if best_bid > mean + width * stdev:
+        take_bid_qty = max(0, min(bid_vol, sell_cap))
+    return take_ask_qty, take_bid_qty
 
 
 class Trader:
+    __slots__ = ("kelp_vwap_vals", "kelp_vwap_vols", "kelp_vwap_num", "kelp_vwap_den",
+                 "kelp_prices", "squid_ink_prices", "kelp_sum", "kelp_sumsq",
+                 "squid_sum", "squid_sumsq", "tick", "state_loaded", "trader_data")
+
     def __init__(self):
-        self.kelp_vwap = []
-        self.kelp_prices = []
-        self.squid_ink_prices = []
+        # VWAP window stored column-wise with running sum(vwap * vol) and sum(vol)
+        self.kelp_vwap_vals = deque()
+        self.kelp_vwap_vols = deque()
+        self.kelp_vwap_num = self.kelp_vwap_den = 0
+        self.kelp_prices = deque(maxlen=40)
+        self.squid_ink_prices = deque(maxlen=50)
+        # Running sums: KELP over its last 20 prices, SQUID_INK over the whole buffer
+        self.kelp_sum = self.kelp_sumsq = 0.0
+        self.squid_sum = self.squid_sumsq = 0.0
         self.tick = 0
-
-    def resin_strategy(self, product, order_depth, fair_value, width, position, position_limit) -> List[Order]:
-        orders = []
-
-        if order_depth.sell_orders:
-            best_ask = min(order_depth.sell_orders)
-            if best_ask <= fair_value - width:
-                qty = min(-order_depth.sell_orders[best_ask],
-                          position_limit - position)
-                if qty > 0:
-                    orders.append(Order(product, best_ask, qty))
-
-        if order_depth.buy_orders:
-            best_bid = max(order_depth.buy_orders)
-            if best_bid >= fair_value + width:
-                qty = min(
-                    order_depth.buy_orders[best_bid], position_limit + position)
-                if qty > 0:
-                    orders.append(Order(product, best_bid, -qty))
-
-        baaf = min([p for p in order_depth.sell_orders if p >
-                   fair_value + width], default=fair_value + width + 1)
-        bbbf = max([p for p in order_depth.buy_orders if p <
-                   fair_value - width], default=fair_value - width - 1)
-
-        buy_qty = position_limit - position
-        sell_qty = position_limit + position
-
-        if buy_qty > 0:
-            orders.append(Order(product, bbbf + 1, buy_qty))
-        if sell_qty > 0:
-            orders.append(Order(product, baaf - 1, -sell_qty))
-
-        return orders
-
-    def kelp_strategy(self, product, order_depth, position, position_limit) -> List[Order]:
-        orders = []
-
-        if order_depth.sell_orders and order_depth.buy_orders:
-            best_ask = min(order_depth.sell_orders)
-            best_bid = max(order_depth.buy_orders)
-            ask_vol = -order_depth.sell_orders[best_ask]
-            bid_vol = order_depth.buy_orders[best_bid]
+        self.state_loaded = False
+        self.trader_data = ""
+
+    def load_state(self, trader_data):
+        """Rebuild the price and VWAP windows and their running sums after a restart"""
+        kelp_prices, squid_ink_prices, vwap_vals, vwap_vols = json.loads(trader_data)
+        self.kelp_prices.extend(kelp_prices)
+        self.squid_ink_prices.extend(squid_ink_prices)
+        self.kelp_vwap_vals.extend(vwap_vals)
+        self.kelp_vwap_vols.extend(vwap_vols)
+        recent = kelp_prices[-20:]
+        self.kelp_sum = float(sum(recent))
+        self.kelp_sumsq = float(sum(p * p for p in recent))
+        self.squid_sum = float(sum(self.squid_ink_prices))
+        self.squid_sumsq = float(sum(p * p for p in self.squid_ink_prices))
+        self.kelp_vwap_num = sum(v * w for v, w in zip(vwap_vals, vwap_vols))
+        self.kelp_vwap_den = sum(vwap_vols)
+
+    def resin_strategy_10k(self, product, asks, bids, position, position_limit) -> List[Order]:
+        """Market making around RAINFOREST_RESIN's fixed 10000 fair value, all in integer ticks"""
+        if not asks and not bids:
+            return []
+        best_ask, best_ask_vol = asks[0] if asks else (None, 0)
+        best_bid, best_bid_vol = bids[0] if bids else (None, 0)
+
+        buy_cap = max(0, position_limit - position)
+        sell_cap = max(0, position_limit + position)
+        take_buy = take_sell = 0
+        if best_ask is not None and best_ask <= RESIN_BUY_AT:
+            take_buy = max(0, min(-best_ask_vol, buy_cap))
+        if best_bid is not None and best_bid >= RESIN_SELL_AT:
+            take_sell = max(0, min(best_bid_vol, sell_cap))
+
+        if best_ask is None or best_bid is None:
+            # One-sided book: take what qualifies but post no passive quotes into it
+            return [Order(product, price, qty) for price, qty in (
+                (best_ask, take_buy), (best_bid, -take_sell)) if qty]
+
+        baaf = ask_above(asks, RESIN_SELL_AT - 1)
+        bbbf = bid_below(bids, RESIN_BUY_AT + 1)
+        if baaf is None:
+            baaf = RESIN_SELL_AT + 1
+        if bbbf is None:
+            bbbf = RESIN_BUY_AT - 1
+
+        # Takes first, then the passive quotes one tick inside the levels beyond fair
+        return [Order(product, price, qty) for price, qty in (
+            (best_ask, take_buy), (best_bid, -take_sell),
+            (bbbf + 1, buy_cap), (baaf - 1, -sell_cap)) if qty]
+
+    def kelp_strategy(self, product, asks, bids, position, position_limit) -> List[Order]:
+        if asks and bids:
+            best_ask, ask_vol = asks[0]
+            best_bid, bid_vol = bids[0]
+            ask_vol = -ask_vol
             mid_price = (best_ask + best_bid) / 2
 
             self.kelp_prices.append(mid_price)
-            if len(self.kelp_prices) > 40:
-                self.kelp_prices.pop(0)
-
-            volatility = statistics.stdev(
-                self.kelp_prices[-20:]) if len(self.kelp_prices) >= 20 else 0
+            self.kelp_sum += mid_price
+            self.kelp_sumsq += mid_price * mid_price
+            if len(self.kelp_prices) > 20:
+                old = self.kelp_prices[-21]
+                self.kelp_sum -= old
+                self.kelp_sumsq -= old * old
+
+            volatility = sample_stdev(
+                self.kelp_sum, self.kelp_sumsq, 20) if len(self.kelp_prices) >= 20 else 0
             vwap_window = 8 if volatility > 4 else 16
 
             total_vol = ask_vol + bid_vol
             current_vwap = (best_bid * ask_vol + best_ask *
                             bid_vol) // total_vol if total_vol else int(mid_price)
-            self.kelp_vwap.append({"vwap": current_vwap, "vol": total_vol})
-            if len(self.kelp_vwap) > vwap_window:
-                self.kelp_vwap.pop(0)
-
-            total_weighted = sum(x["vwap"] * x["vol"] for x in self.kelp_vwap)
-            total_vol = sum(x["vol"] for x in self.kelp_vwap)
+            self.kelp_vwap_vals.append(current_vwap)
+            self.kelp_vwap_vols.append(total_vol)
+            self.kelp_vwap_num += current_vwap * total_vol
+            self.kelp_vwap_den += total_vol
+            if len(self.kelp_vwap_vals) > vwap_window:
+                old_vwap = self.kelp_vwap_vals.popleft()
+                old_vol = self.kelp_vwap_vols.popleft()
+                self.kelp_vwap_num -= old_vwap * old_vol
+                self.kelp_vwap_den -= old_vol
+
+            total_weighted = self.kelp_vwap_num
+            total_vol = self.kelp_vwap_den
             fair_value = total_weighted // total_vol if total_vol else int(
                 mid_price)
 
-            spread = best_ask - best_bid
-            min_edge = max(1, int(spread * 0.3))
-            take_spread = max(2, int(spread * 0.6))
-
-            if spread >= take_spread:
-                if fair_value - best_ask >= min_edge:
-                    qty = min(ask_vol, position_limit - position)
-                    if qty > 0:
-                        orders.append(Order(product, best_ask, qty))
+            take_ask_qty, take_bid_qty, buy_qty, sell_qty = kelp_core(
+                best_ask, best_bid, ask_vol, bid_vol, fair_value, position, position_limit)
 
-                if best_bid - fair_value >= min_edge:
-                    qty = min(bid_vol, position_limit + position)
-                    if qty > 0:
-                        orders.append(Order(product, best_bid, -qty))
+            baaf = ask_above(asks, fair_value + 1)
+            bbbf = bid_below(bids, fair_value - 1)
+            if baaf is None:
+                baaf = fair_value + 2
+            if bbbf is None:
+                bbbf = fair_value - 2
 
-            baaf = min([p for p in order_depth.sell_orders if p >
-                       fair_value + 1], default=fair_value + 2)
-            bbbf = max([p for p in order_depth.buy_orders if p <
-                       fair_value - 1], default=fair_value - 2)
+            return [Order(product, price, qty) for price, qty in (
+                (best_ask, take_ask_qty), (best_bid, -take_bid_qty),
+                (bbbf + 1, buy_qty), (baaf - 1, -sell_qty)) if qty]
 
-            buy_qty = position_limit - position
-            sell_qty = position_limit + position
+        return []
 
-            if buy_qty > 0:
-                orders.append(Order(product, bbbf + 1, buy_qty))
-            if sell_qty > 0:
-                orders.append(Order(product, baaf - 1, -sell_qty))
-
-        return orders
-
-    def squid_strategy(self, product, order_depth, position, position_limit) -> List[Order]:
-        orders = []
-
-        if order_depth.sell_orders and order_depth.buy_orders:
-            best_ask = min(order_depth.sell_orders)
-            best_bid = max(order_depth.buy_orders)
+    def squid_strategy(self, product, asks, bids, position, position_limit) -> List[Order]:
+        if asks and bids:
+            best_ask, best_ask_vol = asks[0]
+            best_bid, best_bid_vol = bids[0]
             mid_price = (best_ask + best_bid) / 2
+            if len(self.squid_ink_prices) == self.squid_ink_prices.maxlen:
+                old = self.squid_ink_prices[0]
+                self.squid_sum -= old
+                self.squid_sumsq -= old * old
             self.squid_ink_prices.append(mid_price)
-            if len(self.squid_ink_prices) > 50:
-                self.squid_ink_prices.pop(0)
-
-            if len(self.squid_ink_prices) >= 10:
-                mean = statistics.mean(self.squid_ink_prices)
-                stdev = statistics.stdev(self.squid_ink_prices)
-                upper_band = mean + 1.2 * stdev
-                lower_band = mean - 1.2 * stdev
-
-                if best_ask < lower_band:
-                    qty = min(-order_depth.sell_orders[best_ask],
-                              position_limit - position)
-                    if qty > 0:
-                        orders.append(Order(product, best_ask, qty))
-                if best_bid > upper_band:
-                    qty = min(
-                        order_depth.buy_orders[best_bid], position_limit + position)
-                    if qty > 0:
-                        orders.append(Order(product, best_bid, -qty))
-
-        return orders
+            self.squid_sum += mid_price
+            self.squid_sumsq += mid_price * mid_price
+
+            n = len(self.squid_ink_prices)
+            if n >= 10:
+                take_ask_qty, take_bid_qty = squid_core(
+                    best_ask, best_bid, -best_ask_vol,
+                    best_bid_vol, self.squid_sum, self.squid_sumsq,
+                    n, 1.2, position, position_limit)
+                return [Order(product, price, qty) for price, qty in (
+                    (best_ask, take_ask_qty), (best_bid, -take_bid_qty)) if qty]
+
+        return []
 
     def run(self, state: TradingState):
         result = {}
         self.tick += 1
+        if not self.state_loaded:
+            self.state_loaded = True
+            if state.traderData:
+                self.load_state(state.traderData)
 
         if "RAINFOREST_RESIN" in state.order_depths:
             pos = state.position.get("RAINFOREST_RESIN", 0)
-            result["RAINFOREST_RESIN"] = self.resin_strategy(
+            result["RAINFOREST_RESIN"] = self.resin_strategy_10k(
                 "RAINFOREST_RESIN",
-                state.order_depths["RAINFOREST_RESIN"],
-                fair_value=10000,
-                width=1.8,
+                *sorted_book(state.order_depths["RAINFOREST_RESIN"]),
                 position=pos,
                 position_limit=50
             )
@@ -154,7 +252,7 @@ class Trader:
             pos = state.position.get("KELP", 0)
             result["KELP"] = self.kelp_strategy(
                 "KELP",
-                state.order_depths["KELP"],
+                *sorted_book(state.order_depths["KELP"]),
                 position=pos,
                 position_limit=50
             )
@@ -163,14 +261,14 @@ class Trader:
             pos = state.position.get("SQUID_INK", 0)
             result["SQUID_INK"] = self.squid_strategy(
                 "SQUID_INK",
-                state.order_depths["SQUID_INK"],
+                *sorted_book(state.order_depths["SQUID_INK"]),
                 position=pos,
                 position_limit=50
             )
 
-        trader_data = {
-            "kelp_vwap": self.kelp_vwap,
-            "kelp_prices": self.kelp_prices,
-            "squid_ink_prices": self.squid_ink_prices,
-        }
-        return result, 1, jsonpickle.encode(trader_data)
+        if self.tick % TRADER_DATA_INTERVAL == 1:
+            self.trader_data = json.dumps([
+                list(self.kelp_prices), list(self.squid_ink_prices),
+                list(self.kelp_vwap_vals), list(self.kelp_vwap_vols),
+            ], separators=(",", ":"))
+        return result, 1, self.trader_data
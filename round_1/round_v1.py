@@ -1,7 +1,13 @@
 import json
-import statistics
+import math
+from itertools import chain
+from collections import deque
 from datamodel import Listing, Observation, Order, OrderDepth, ProsperityEncoder, Symbol, Trade, TradingState
 
+# Resin asks at or below / bids at or above these ticks get taken
+RESIN_BUY_AT = 9998
+RESIN_SELL_AT = 10002
+
 
 # ========== LOGGER FOR JMERELE VISUALIZER ==========
 class Logger:
@@ -13,24 +19,26 @@ class Logger:
         self.logs += sep.join(map(str, objects)) + end
 
     def flush(self, state: TradingState, orders: dict, conversions: int, trader_data: str) -> None:
-        base_length = len(
-            self.to_json([
-                self.compress_state(state, ""),
-                self.compress_orders(orders),
-                conversions,
-                "",
-                "",
-            ])
-        )
-        max_item_length = (self.max_log_length - base_length) // 3
-        print(self.to_json([
-            self.compress_state(state, self.truncate(
-                state.traderData, max_item_length)),
+        # One full serialization; the three strings are spliced into their slots
+        base = self.to_json([
+            self.compress_state(state, ""),
             self.compress_orders(orders),
             conversions,
-            self.truncate(trader_data, max_item_length),
-            self.truncate(self.logs, max_item_length),
-        ]))
+            "",
+            "",
+        ])
+        max_item_length = (self.max_log_length - len(base)) // 3
+
+        # Plain strings encode the same without the custom encoder, so use json's cached one
+        head = "[[" + str(state.timestamp) + ","
+        print(
+            head
+            + json.dumps(self.truncate(state.traderData, max_item_length))
+            + base[len(head) + 2:-7]
+            + "," + json.dumps(self.truncate(trader_data, max_item_length))
+            + "," + json.dumps(self.truncate(self.logs, max_item_length))
+            + "]"
+        )
         self.logs = ""
 
     def compress_state(self, state: TradingState, trader_data: str):
@@ -42,9 +50,9 @@ class Logger:
             {s: [od.buy_orders, od.sell_orders]
                 for s, od in state.order_depths.items()},
             [[t.symbol, t.price, t.quantity, t.buyer, t.seller, t.timestamp]
-             for trades in state.own_trades.values() for t in trades],
+             for t in chain.from_iterable(state.own_trades.values())],
             [[t.symbol, t.price, t.quantity, t.buyer, t.seller, t.timestamp]
-             for trades in state.market_trades.values() for t in trades],
+             for t in chain.from_iterable(state.market_trades.values())],
             state.position,
             [
                 state.observations.plainValueObservations,
@@ -54,7 +62,7 @@ class Logger:
         ]
 
     def compress_orders(self, orders: dict):
-        return [[o.symbol, o.price, o.quantity] for order_list in orders.values() for o in order_list]
+        return [[o.symbol, o.price, o.quantity] for o in chain.from_iterable(orders.values())]
 
     def to_json(self, value) -> str:
         return json.dumps(value, cls=ProsperityEncoder, separators=(",", ":"))
@@ -66,119 +74,165 @@ class Logger:
 logger = Logger()
 
 
+def sample_stdev(total, total_sq, n):
+    """Sample standard deviation from a window's running sum and sum of squares"""
+    return math.sqrt(max(n * total_sq - total * total, 0.0) / (n * (n - 1)))
+
+
 # ========== STRATEGY ==========
 class Trader:
-    def __init__(self):
-        self.kelp_vwap = []
-        self.kelp_prices = []
-        self.squid_prices = []
+    __slots__ = ("kelp_vwap_vals", "kelp_vwap_vols", "kelp_vwap_num", "kelp_vwap_den",
+                 "kelp_prices", "squid_prices", "kelp_sum", "kelp_sumsq", "squid_sum",
+                 "squid_sumsq")
 
-    def resin_strategy(self, order_depth, fair_value, width, position, position_limit):
-        orders = []
+    def __init__(self):
+        # VWAP window stored column-wise with running sum(vwap * vol) and sum(vol)
+        self.kelp_vwap_vals = deque()
+        self.kelp_vwap_vols = deque()
+        self.kelp_vwap_num = self.kelp_vwap_den = 0
+        self.kelp_prices = deque(maxlen=40)
+        self.squid_prices = deque(maxlen=50)
+        # Running sums: KELP over its last 20 prices, SQUID_INK over the whole buffer
+        self.kelp_sum = self.kelp_sumsq = 0.0
+        self.squid_sum = self.squid_sumsq = 0.0
+
+    def load_state(self, trader_data):
+        """Rebuild the price and VWAP windows and their running sums after a restart"""
+        kelp_prices, squid_prices, vwap_vals, vwap_vols = json.loads(trader_data)
+        self.kelp_prices.extend(kelp_prices)
+        self.squid_prices.extend(squid_prices)
+        self.kelp_vwap_vals.extend(vwap_vals)
+        self.kelp_vwap_vols.extend(vwap_vols)
+        recent = kelp_prices[-20:]
+        self.kelp_sum = float(sum(recent))
+        self.kelp_sumsq = float(sum(p * p for p in recent))
+        self.squid_sum = float(sum(self.squid_prices))
+        self.squid_sumsq = float(sum(p * p for p in self.squid_prices))
+        self.kelp_vwap_num = sum(v * w for v, w in zip(vwap_vals, vwap_vols))
+        self.kelp_vwap_den = sum(vwap_vols)
+
+    def resin_strategy_10k(self, order_depth, position, position_limit):
+        """Take RAINFOREST_RESIN levels through its fixed 10000 +/- 1.8 band, in integer ticks"""
+        buy_cap = position_limit - position
+        sell_cap = position_limit + position
+        best_ask = best_bid = None
+        take_buy = take_sell = 0
         if order_depth.sell_orders:
-            best_ask = min(order_depth.sell_orders)
-            if best_ask <= fair_value - width:
-                qty = min(-order_depth.sell_orders[best_ask],
-                          position_limit - position)
-                if qty > 0:
-                    orders.append(Order("RAINFOREST_RESIN", best_ask, qty))
+            best_ask, best_ask_vol = min(order_depth.sell_orders.items())
+            if best_ask <= RESIN_BUY_AT:
+                take_buy = max(0, min(-best_ask_vol, buy_cap))
 
         if order_depth.buy_orders:
-            best_bid = max(order_depth.buy_orders)
-            if best_bid >= fair_value + width:
-                qty = min(
-                    order_depth.buy_orders[best_bid], position + position_limit)
-                if qty > 0:
-                    orders.append(Order("RAINFOREST_RESIN", best_bid, -qty))
+            best_bid, best_bid_vol = max(order_depth.buy_orders.items())
+            if best_bid >= RESIN_SELL_AT:
+                take_sell = max(0, min(best_bid_vol, sell_cap))
 
-        return orders
+        return [Order("RAINFOREST_RESIN", price, qty) for price, qty in (
+            (best_ask, take_buy), (best_bid, -take_sell)) if qty]
 
     def kelp_strategy(self, order_depth, position, position_limit):
-        orders = []
+        buy_cap = position_limit - position
+        sell_cap = position_limit + position
         if order_depth.sell_orders and order_depth.buy_orders:
-            best_ask = min(order_depth.sell_orders)
-            best_bid = max(order_depth.buy_orders)
+            best_ask, best_ask_vol = min(order_depth.sell_orders.items())
+            best_bid, best_bid_vol = max(order_depth.buy_orders.items())
             mid_price = (best_ask + best_bid) / 2
             self.kelp_prices.append(mid_price)
-
-            if len(self.kelp_prices) > 40:
-                self.kelp_prices.pop(0)
-
-            volatility = statistics.stdev(
-                self.kelp_prices[-20:]) if len(self.kelp_prices) >= 20 else 0
+            self.kelp_sum += mid_price
+            self.kelp_sumsq += mid_price * mid_price
+            if len(self.kelp_prices) > 20:
+                old = self.kelp_prices[-21]
+                self.kelp_sum -= old
+                self.kelp_sumsq -= old * old
+
+            volatility = sample_stdev(
+                self.kelp_sum, self.kelp_sumsq, 20) if len(self.kelp_prices) >= 20 else 0
             vwap_window = 8 if volatility > 4 else 16
 
-            ask_vol = -order_depth.sell_orders[best_ask]
-            bid_vol = order_depth.buy_orders[best_bid]
+            ask_vol = -best_ask_vol
+            bid_vol = best_bid_vol
             total_vol = ask_vol + bid_vol
             current_vwap = int((best_bid * ask_vol + best_ask *
                                bid_vol) / total_vol) if total_vol else int(mid_price)
 
-            self.kelp_vwap.append({"vwap": current_vwap, "vol": total_vol})
-            if len(self.kelp_vwap) > vwap_window:
-                self.kelp_vwap.pop(0)
-
-            total_weighted = sum(x["vwap"] * x["vol"] for x in self.kelp_vwap)
-            total_vol = sum(x["vol"] for x in self.kelp_vwap)
+            self.kelp_vwap_vals.append(current_vwap)
+            self.kelp_vwap_vols.append(total_vol)
+            self.kelp_vwap_num += current_vwap * total_vol
+            self.kelp_vwap_den += total_vol
+            if len(self.kelp_vwap_vals) > vwap_window:
+                old_vwap = self.kelp_vwap_vals.popleft()
+                old_vol = self.kelp_vwap_vols.popleft()
+                self.kelp_vwap_num -= old_vwap * old_vol
+                self.kelp_vwap_den -= old_vol
+
+            total_weighted = self.kelp_vwap_num
+            total_vol = self.kelp_vwap_den
             fair_value = int(total_weighted /
                              total_vol) if total_vol else int(mid_price)
 
             spread = best_ask - best_bid
-            min_edge = max(1, int(spread * 0.3))
-            take_spread = max(2, int(spread * 0.6))
+            min_edge = max(1, spread * 3 // 10)
+            take_spread = max(2, spread * 6 // 10)
 
+            take_buy = take_sell = 0
             if spread >= take_spread:
                 if fair_value - best_ask >= min_edge:
-                    qty = min(ask_vol, position_limit - position)
-                    if qty > 0:
-                        orders.append(Order("KELP", best_ask, qty))
+                    take_buy = max(0, min(ask_vol, buy_cap))
                 if best_bid - fair_value >= min_edge:
-                    qty = min(bid_vol, position + position_limit)
-                    if qty > 0:
-                        orders.append(Order("KELP", best_bid, -qty))
+                    take_sell = max(0, min(bid_vol, sell_cap))
+
+            return [Order("KELP", price, qty) for price, qty in (
+                (best_ask, take_buy), (best_bid, -take_sell)) if qty]
 
-        return orders
+        return []
 
     def squid_strategy(self, order_depth, position, position_limit):
-        orders = []
+        buy_cap = position_limit - position
+        sell_cap = position_limit + position
         if order_depth.sell_orders and order_depth.buy_orders:
-            best_ask = min(order_depth.sell_orders)
-            best_bid = max(order_depth.buy_orders)
+            best_ask, best_ask_vol = min(order_depth.sell_orders.items())
+            best_bid, best_bid_vol = max(order_depth.buy_orders.items())
             mid_price = (best_ask + best_bid) / 2
+            if len(self.squid_prices) == self.squid_prices.maxlen:
+                old = self.squid_prices[0]
+                self.squid_sum -= old
+                self.squid_sumsq -= old * old
             self.squid_prices.append(mid_price)
-
-            if len(self.squid_prices) > 50:
-                self.squid_prices.pop(0)
-
-            if len(self.squid_prices) >= 10:
-                mean = statistics.mean(self.squid_prices)
-                stdev = statistics.stdev(self.squid_prices)
+            self.squid_sum += mid_price
+            self.squid_sumsq += mid_price * mid_price
+
+            n = len(self.squid_prices)
+            if n >= 10:
+                stdev = sample_stdev(self.squid_sum, self.squid_sumsq, n)
+                if stdev == 0:
+                    # A flat window holds the current mid, so neither side of the book can breach a band
+                    return []
+                mean = self.squid_sum / n
                 upper_band = mean + 1.3 * stdev
                 lower_band = mean - 1.3 * stdev
 
+                take_buy = take_sell = 0
                 if best_ask < lower_band:
-                    qty = min(-order_depth.sell_orders[best_ask],
-                              position_limit - position)
-                    if qty > 0:
-                        orders.append(Order("SQUID_INK", best_ask, qty))
+                    take_buy = max(0, min(-best_ask_vol, buy_cap))
                 if best_bid > upper_band:
-                    qty = min(
-                        order_depth.buy_orders[best_bid], position + position_limit)
-                    if qty > 0:
-                        orders.append(Order("SQUID_INK", best_bid, -qty))
+                    take_sell = max(0, min(best_bid_vol, sell_cap))
+
+                return [Order("SQUID_INK", price, qty) for price, qty in (
+                    (best_ask, take_buy), (best_bid, -take_sell)) if qty]
 
-        return orders
+        return []
 
     def run(self, state: TradingState):
         orders = {}
         conversions = 0
         trader_data = ""
+        if state.traderData and not self.kelp_prices and not self.squid_prices:
+            self.load_state(state.traderData)
 
         if "RAINFOREST_RESIN" in state.order_depths:
             pos = state.position.get("RAINFOREST_RESIN", 0)
-            orders["RAINFOREST_RESIN"] = self.resin_strategy(
-                state.order_depths["RAINFOREST_RESIN"], fair_value=10000, width=1.8,
-                position=pos, position_limit=50
+            orders["RAINFOREST_RESIN"] = self.resin_strategy_10k(
+                state.order_depths["RAINFOREST_RESIN"], position=pos, position_limit=50
             )
 
         if "KELP" in state.order_depths:
@@ -193,11 +247,10 @@ class Trader:
                 state.order_depths["SQUID_INK"], position=pos, position_limit=50
             )
 
-        trader_data = json.dumps({
-            "kelp_vwap": self.kelp_vwap,
-            "kelp_prices": self.kelp_prices,
-            "squid_prices": self.squid_prices
-        })
+        trader_data = json.dumps([
+            list(self.kelp_prices), list(self.squid_prices),
+            list(self.kelp_vwap_vals), list(self.kelp_vwap_vols),
+        ], separators=(",", ":"))
 
         logger.flush(state, orders, conversions, trader_data)
         return orders, conversions, trader_data
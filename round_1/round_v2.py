@@ -1,110 +1,159 @@
 from datamodel import OrderDepth, TradingState, Order
 from typing import List
-import jsonpickle
-import statistics
-
+from collections import deque
+import numpy as np
+
+# Resin band edges in ticks, also the bounds for the quote-anchor scans
+RESIN_BUY_AT = 9998
+RESIN_SELL_AT = 10002
+
+
+def scan_asks(sell_orders, threshold):
+    """One pass over the asks: best ask, its volume and the lowest ask above threshold"""
+    best = above = None
+    best_vol = 0
+    for price, vol in sell_orders.items():
+        if best is None or price < best:
+            best, best_vol = price, vol
+        if price > threshold and (above is None or price < above):
+            above = price
+    return best, best_vol, above
+
+
+def scan_bids(buy_orders, threshold):
+    """One pass over the bids: best bid, its volume and the highest bid below threshold"""
+    best = below = None
+    best_vol = 0
+    for price, vol in buy_orders.items():
+        if best is None or price > best:
+            best, best_vol = price, vol
+        if price < threshold and (below is None or price > below):
+            below = price
+    return best, best_vol, below
+
+
+def ask_above(sell_orders, best_ask, threshold):
+    """Lowest ask above threshold; the best ask already qualifies in the common case"""
+    if best_ask > threshold:
+        return best_ask
+    return min((p for p in sell_orders if p > threshold), default=None)
+
+
+def bid_below(buy_orders, best_bid, threshold):
+    """Highest bid below threshold; the best bid already qualifies in the common case"""
+    if best_bid < threshold:
+        return best_bid
+    return max((p for p in buy_orders if p < threshold), default=None)
+
+
+def push_price(buf, n, price):
+    """Append price after the first n slots of buf, sliding the newest half to the front when full"""
+    if n == len(buf):
+        half = len(buf) // 2
+        buf[:half] = buf[half:]
+        n = half
+    buf[n] = price
+    return n + 1
 
 class Trader:
     def __init__(self):
-        self.kelp_vwap = []
-        self.kelp_prices = []
-        self.squid_vwap = []
-        self.squid_ink_prices = []
+        # VWAP windows stored column-wise as (vwaps, vols, [sum(vwap * vol), sum(vol)])
+        self.kelp_vwap = (deque(), deque(), [0, 0])
+        # [buffer, fill count]: mids in a linear-write buffer that slides back to the newest 40 when full
+        self.kelp_prices = [np.empty(80), 0]
+        self.squid_vwap = (deque(), deque(), [0, 0])
+        self.squid_ink_prices = [np.empty(80), 0]
         self.tick = 0
 
-    def resin_strategy(self, product, order_depth, fair_value, width, position, position_limit) -> List[Order]:
-        orders = []
-
-        if order_depth.sell_orders:
-            best_ask = min(order_depth.sell_orders)
-            if best_ask <= fair_value - width:
-                qty = min(-order_depth.sell_orders[best_ask],
-                          position_limit - position)
-                if qty > 0:
-                    orders.append(Order(product, best_ask, qty))
-
-        if order_depth.buy_orders:
-            best_bid = max(order_depth.buy_orders)
-            if best_bid >= fair_value + width:
-                qty = min(order_depth.buy_orders[best_bid],
-                          position_limit + position)
-                if qty > 0:
-                    orders.append(Order(product, best_bid, -qty))
-
-        baaf = min([p for p in order_depth.sell_orders if p >
-                   fair_value + width], default=fair_value + width + 1)
-        bbbf = max([p for p in order_depth.buy_orders if p <
-                   fair_value - width], default=fair_value - width - 1)
-
-        buy_qty = position_limit - position
-        sell_qty = position_limit + position
-
-        if buy_qty > 0:
-            orders.append(Order(product, bbbf + 1, buy_qty))
-        if sell_qty > 0:
-            orders.append(Order(product, baaf - 1, -sell_qty))
-
-        return orders
+    def resin_strategy_10k(self, product, order_depth, position, position_limit) -> List[Order]:
+        """Market making around RAINFOREST_RESIN's fixed 10000 fair value, all in integer ticks"""
+        if not order_depth.sell_orders and not order_depth.buy_orders:
+            return []
+        best_ask, best_ask_vol, baaf = scan_asks(
+            order_depth.sell_orders, RESIN_SELL_AT - 1)
+        best_bid, best_bid_vol, bbbf = scan_bids(
+            order_depth.buy_orders, RESIN_BUY_AT + 1)
+
+        buy_cap = max(0, position_limit - position)
+        sell_cap = max(0, position_limit + position)
+        take_buy = take_sell = 0
+        if best_ask is not None and best_ask <= RESIN_BUY_AT:
+            take_buy = max(0, min(-best_ask_vol, buy_cap))
+        if best_bid is not None and best_bid >= RESIN_SELL_AT:
+            take_sell = max(0, min(best_bid_vol, sell_cap))
+
+        if best_ask is None or best_bid is None:
+            # One-sided book: take what qualifies but post no passive quotes into it
+            return [Order(product, price, qty) for price, qty in (
+                (best_ask, take_buy), (best_bid, -take_sell)) if qty]
+
+        if baaf is None:
+            baaf = RESIN_SELL_AT + 1
+        if bbbf is None:
+            bbbf = RESIN_BUY_AT - 1
+
+        # Takes first, then the passive quotes one tick inside the levels beyond fair
+        return [Order(product, price, qty) for price, qty in (
+            (best_ask, take_buy), (best_bid, -take_sell),
+            (bbbf + 1, buy_cap), (baaf - 1, -sell_cap)) if qty]
 
     def vwap_strategy(self, product, order_depth, position, position_limit, price_list, vwap_data) -> List[Order]:
-        orders = []
+        buy_cap = max(0, position_limit - position)
+        sell_cap = max(0, position_limit + position)
 
         if order_depth.sell_orders and order_depth.buy_orders:
-            best_ask = min(order_depth.sell_orders)
-            best_bid = max(order_depth.buy_orders)
-            ask_vol = -order_depth.sell_orders[best_ask]
-            bid_vol = order_depth.buy_orders[best_bid]
+            best_ask, ask_vol = min(order_depth.sell_orders.items())
+            best_bid, bid_vol = max(order_depth.buy_orders.items())
+            ask_vol = -ask_vol
             mid_price = (best_ask + best_bid) / 2
 
-            price_list.append(mid_price)
-            if len(price_list) > 40:
-                price_list.pop(0)
+            prices = price_list[0]
+            n = price_list[1] = push_price(prices, price_list[1], mid_price)
 
-            volatility = statistics.stdev(
-                price_list[-20:]) if len(price_list) >= 20 else 0
+            volatility = float(prices[n - 20:n].std(ddof=1)) if n >= 20 else 0
             vwap_window = 8 if volatility > 4 else 16
 
             total_vol = ask_vol + bid_vol
             current_vwap = (best_bid * ask_vol + best_ask *
                             bid_vol) // total_vol if total_vol else int(mid_price)
-            vwap_data.append({"vwap": current_vwap, "vol": total_vol})
-            if len(vwap_data) > vwap_window:
-                vwap_data.pop(0)
-
-            total_weighted = sum(x["vwap"] * x["vol"] for x in vwap_data)
-            total_vol = sum(x["vol"] for x in vwap_data)
+            vals, vols, sums = vwap_data
+            vals.append(current_vwap)
+            vols.append(total_vol)
+            sums[0] += current_vwap * total_vol
+            sums[1] += total_vol
+            if len(vals) > vwap_window:
+                old_vwap, old_vol = vals.popleft(), vols.popleft()
+                sums[0] -= old_vwap * old_vol
+                sums[1] -= old_vol
+
+            total_weighted, total_vol = sums
             fair_value = total_weighted // total_vol if total_vol else int(
                 mid_price)
 
             spread = best_ask - best_bid
-            min_edge = max(1, int(spread * 0.3))
-            take_spread = max(2, int(spread * 0.6))
+            min_edge = max(1, spread * 3 // 10)
+            take_spread = max(2, spread * 6 // 10)
 
+            take_buy = take_sell = 0
             if spread >= take_spread:
                 if fair_value - best_ask >= min_edge:
-                    qty = min(ask_vol, position_limit - position)
-                    if qty > 0:
-                        orders.append(Order(product, best_ask, qty))
-
+                    take_buy = max(0, min(ask_vol, buy_cap))
                 if best_bid - fair_value >= min_edge:
-                    qty = min(bid_vol, position_limit + position)
-                    if qty > 0:
-                        orders.append(Order(product, best_bid, -qty))
-
-            baaf = min([p for p in order_depth.sell_orders if p >
-                       fair_value + 1], default=fair_value + 2)
-            bbbf = max([p for p in order_depth.buy_orders if p <
-                       fair_value - 1], default=fair_value - 2)
+                    take_sell = max(0, min(bid_vol, sell_cap))
 
-            buy_qty = position_limit - position
-            sell_qty = position_limit + position
+            baaf = ask_above(order_depth.sell_orders, best_ask, fair_value + 1)
+            bbbf = bid_below(order_depth.buy_orders, best_bid, fair_value - 1)
+            if baaf is None:
+                baaf = fair_value + 2
+            if bbbf is None:
+                bbbf = fair_value - 2
 
-            if buy_qty > 0:
-                orders.append(Order(product, bbbf + 1, buy_qty))
-            if sell_qty > 0:
-                orders.append(Order(product, baaf - 1, -sell_qty))
+            # At most four orders, built in one pass over the fixed slots
+            return [Order(product, price, qty) for price, qty in (
+                (best_ask, take_buy), (best_bid, -take_sell),
+                (bbbf + 1, buy_cap), (baaf - 1, -sell_cap)) if qty]
 
-        return orders
+        return []
 
     def run(self, state: TradingState):
         result = {}
@@ -122,7 +171,7 @@ class Trader:
 
         if "RAINFOREST_RESIN" in state.order_depths:
             resin_pos = state.position.get("RAINFOREST_RESIN", 0)
-            result["RAINFOREST_RESIN"] = self.resin_strategy(
-                "RAINFOREST_RESIN", state.order_depths["RAINFOREST_RESIN"], 10000, 1.8, resin_pos, 50)
+            result["RAINFOREST_RESIN"] = self.resin_strategy_10k(
+                "RAINFOREST_RESIN", state.order_depths["RAINFOREST_RESIN"], resin_pos, 50)
 
         return result, 1, ""
@@ -2,11 +2,103 @@ from datamodel import Order
 import statistics
 
 
+# Per-product strategy and its parameters; run() dispatches on this table
+STRATEGY_CONFIG = {
+    "KELP": ("kelp_orders", {"window": 20, "vol_window": 5, "exposure": 0.6}),
+    "RAINFOREST_RESIN": ("resin_orders", {"window": 15, "edge": 2}),
+    "SQUID_INK": ("squid_orders", {"window": 20, "edge": 4, "exposure": 0.5}),
+}
+
+
 class Trader:
     def __init__(self):
         self.position = {"KELP": 0, "RAINFOREST_RESIN": 0, "SQUID_INK": 0}
         self.price_data = {"KELP": [], "RAINFOREST_RESIN": [], "SQUID_INK": []}
         self.position_limit = 50
+        self.strategies = {product: (getattr(self, name), params)
+                           for product, (name, params) in STRATEGY_CONFIG.items()}
+
+    # ----- KELP: VWAP-based strategy -----
+    def kelp_orders(self, logger, product, prices, best_ask, best_bid, ask_vol, bid_vol, position,
+                    window, vol_window, exposure):
+        if len(prices) < window:
+            return None
+        limit = self.position_limit
+        fair_value = int(statistics.mean(prices[-window:]))
+        volatility = statistics.stdev(
+            prices[-vol_window:]) if len(prices) >= vol_window else 1
+        spread = best_ask - best_bid if best_ask and best_bid else 0
+
+        if spread < 2 or volatility < 0.5:
+            return None
+
+        min_edge = max(1, spread * 3 // 10)
+        take_spread = max(2, spread * 6 // 10)
+        max_exposure = int(limit * exposure)
+
+        orders = []
+        if spread >= take_spread:
+            if fair_value - best_ask >= min_edge and position < max_exposure:
+                qty = min(ask_vol, limit - position)
+                orders.append(Order(product, best_ask, qty))
+                logger.print(
+                    f"[KELP] BUY {qty} @ {best_ask} | FV={fair_value} | Pos={position}")
+
+            if best_bid - fair_value >= min_edge and position > -max_exposure:
+                qty = min(bid_vol, position + limit)
+                orders.append(Order(product, best_bid, -qty))
+                logger.print(
+                    f"[KELP] SELL {qty} @ {best_bid} | FV={fair_value} | Pos={position}")
+        return orders
+
+    # ----- RAINFOREST_RESIN: mean-reversion -----
+    def resin_orders(self, logger, product, prices, best_ask, best_bid, ask_vol, bid_vol, position,
+                     window, edge):
+        limit = self.position_limit
+        fair_value = int(statistics.mean(
+            prices[-window:])) if len(prices) >= window else prices[-1]
+        buy_threshold = fair_value - edge
+        sell_threshold = fair_value + edge
+
+        orders = []
+        if best_ask and best_ask < buy_threshold and position < limit:
+            qty = min(ask_vol, limit - position)
+            orders.append(Order(product, best_ask, qty))
+            logger.print(
+                f"[RESIN] BUY {qty} @ {best_ask} | FV={fair_value} | Pos={position}")
+
+        if best_bid and best_bid > sell_threshold and position > -limit:
+            qty = min(bid_vol, position + limit)
+            orders.append(Order(product, best_bid, -qty))
+            logger.print(
+                f"[RESIN] SELL {qty} @ {best_bid} | FV={fair_value} | Pos={position}")
+        return orders
+
+    # ----- SQUID_INK: conservative threshold strategy -----
+    def squid_orders(self, logger, product, prices, best_ask, best_bid, ask_vol, bid_vol, position,
+                     window, edge, exposure):
+        if len(prices) < window:
+            return None
+        limit = self.position_limit
+        fair_value = int(statistics.mean(prices[-window:]))
+        buy_threshold = fair_value - edge
+        sell_threshold = fair_value + edge
+
+        max_exposure = int(limit * exposure)
+
+        orders = []
+        if best_ask and best_ask < buy_threshold and position < max_exposure:
+            qty = min(ask_vol, limit - position)
+            orders.append(Order(product, best_ask, qty))
+            logger.print(
+                f"[SQUID] BUY {qty} @ {best_ask} | FV={fair_value} | Pos={position}")
+
+        if best_bid and best_bid > sell_threshold and position > -max_exposure:
+            qty = min(bid_vol, position + limit)
+            orders.append(Order(product, best_bid, -qty))
+            logger.print(
+                f"[SQUID] SELL {qty} @ {best_bid} | FV={fair_value} | Pos={position}")
+        return orders
 
     def run(self, state, logger):
         result = {}
@@ -15,10 +107,8 @@ class Trader:
         conversions = {}
 
         for product in state.order_depths:
-            orders = []
             order_depth = state.order_depths[product]
             position = self.position[product]
-            limit = self.position_limit
 
             best_ask = min(order_depth.sell_orders.keys()
                            ) if order_depth.sell_orders else None
@@ -43,78 +133,11 @@ class Trader:
                 self.price_data[product].pop(0)
             prices = self.price_data[product]
 
-            # === STRATEGY LOGIC PER PRODUCT ===
-
-            # ----- KELP: VWAP-based strategy -----
-            if product == "KELP":
-                if len(prices) < 20:
-                    continue
-                fair_value = int(statistics.mean(prices[-20:]))
-                volatility = statistics.stdev(
-                    prices[-5:]) if len(prices) >= 5 else 1
-                spread = best_ask - best_bid if best_ask and best_bid else 0
-
-                if spread < 2 or volatility < 0.5:
-                    continue
-
-                min_edge = max(1, int(spread * 0.3))
-                take_spread = max(2, int(spread * 0.6))
-                max_exposure = int(limit * 0.6)
-
-                if spread >= take_spread:
-                    if fair_value - best_ask >= min_edge and position < max_exposure:
-                        qty = min(ask_vol, limit - position)
-                        orders.append(Order(product, best_ask, qty))
-                        logger.print(
-                            f"[KELP] BUY {qty} @ {best_ask} | FV={fair_value} | Pos={position}")
-
-                    if best_bid - fair_value >= min_edge and position > -max_exposure:
-                        qty = min(bid_vol, position + limit)
-                        orders.append(Order(product, best_bid, -qty))
-                        logger.print(
-                            f"[KELP] SELL {qty} @ {best_bid} | FV={fair_value} | Pos={position}")
-
-            # ----- RAINFOREST_RESIN: mean-reversion -----
-            elif product == "RAINFOREST_RESIN":
-                fair_value = int(statistics.mean(
-                    prices[-15:])) if len(prices) >= 15 else mid_price
-                buy_threshold = fair_value - 2
-                sell_threshold = fair_value + 2
-
-                if best_ask and best_ask < buy_threshold and position < limit:
-                    qty = min(ask_vol, limit - position)
-                    orders.append(Order(product, best_ask, qty))
-                    logger.print(
-                        f"[RESIN] BUY {qty} @ {best_ask} | FV={fair_value} | Pos={position}")
-
-                if best_bid and best_bid > sell_threshold and position > -limit:
-                    qty = min(bid_vol, position + limit)
-                    orders.append(Order(product, best_bid, -qty))
-                    logger.print(
-                        f"[RESIN] SELL {qty} @ {best_bid} | FV={fair_value} | Pos={position}")
-
-            # ----- SQUID_INK: conservative threshold strategy -----
-            elif product == "SQUID_INK":
-                if len(prices) < 20:
-                    continue
-                fair_value = int(statistics.mean(prices[-20:]))
-                buy_threshold = fair_value - 4
-                sell_threshold = fair_value + 4
-
-                max_exposure = int(limit * 0.5)
-
-                if best_ask and best_ask < buy_threshold and position < max_exposure:
-                    qty = min(ask_vol, limit - position)
-                    orders.append(Order(product, best_ask, qty))
-                    logger.print(
-                        f"[SQUID] BUY {qty} @ {best_ask} | FV={fair_value} | Pos={position}")
-
-                if best_bid and best_bid > sell_threshold and position > -max_exposure:
-                    qty = min(bid_vol, position + limit)
-                    orders.append(Order(product, best_bid, -qty))
-                    logger.print(
-                        f"[SQUID] SELL {qty} @ {best_bid} | FV={fair_value} | Pos={position}")
-
+            strategy, params = self.strategies[product]
+            orders = strategy(logger, product, prices, best_ask, best_bid,
+                              ask_vol, bid_vol, position, **params)
+            if orders is None:
+                continue
             result[product] = orders
 
         return result, conversions, trader_data
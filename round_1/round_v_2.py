@@ -1,44 +1,90 @@
+import base64
 import json
-from typing import Any, Dict, List
-import jsonpickle
-import numpy as np
+import math
+import zlib
+from collections import deque
+from dataclasses import dataclass, field
+from itertools import chain
+from typing import Any, Dict, List, Optional, Tuple
 from datamodel import Listing, Observation, Order, OrderDepth, ProsperityEncoder, Symbol, Trade, TradingState
 
+try:
+    from numba import njit
+except ImportError:
+    # adaptive_edge stays a plain function
+    def njit(*args, **kwargs):
+        return lambda fn: fn
+
+
+# Encoded traderData longer than this many bytes is stored zlib-compressed
+TRADER_DATA_COMPRESS_OVER = 512
+
+
+def best_prices(order_depths: Dict[Symbol, OrderDepth]) -> Dict[Symbol, Tuple[int, int]]:
+    """(best_bid, best_ask) per symbol in one pass over the books, 0 for an empty side"""
+    return {symbol: (max(depth.buy_orders, default=0), min(depth.sell_orders, default=0))
+            for symbol, depth in order_depths.items()}
+
+
+def trader_data_default(obj: Any) -> Any:
+    """Rolling windows go out as lists and state dataclasses as dicts"""
+    if isinstance(obj, deque):
+        return list(obj)
+    return {name: getattr(obj, name) for name in obj.__slots__}
+
+
+def encode_trader_data(value: Any) -> str:
+    payload = json.dumps(value, default=trader_data_default, separators=(",", ":")).encode()
+    # Large payloads share the log budget, so they go out deflated behind a "z" marker
+    if len(payload) > TRADER_DATA_COMPRESS_OVER:
+        return "z" + base64.b64encode(zlib.compress(payload)).decode()
+    return payload.decode()
+
+
+def decode_trader_data(value: str) -> Any:
+    payload = zlib.decompress(base64.b64decode(value[1:])) if value[0] == "z" else value
+    return json.loads(payload)
+
+
+@njit(cache=True)
+def adaptive_edge(price_sum, price_sumsq, n, avg_position, base_edge, min_edge, position_limit):
+    """Squid edge from the price window's running sums and the average recent position"""
+    mean = price_sum / n
+    volatility = math.sqrt(max(price_sumsq / n - mean * mean, 0.0))
+    position_factor = 1 - abs(avg_position) / position_limit
+    return max(min_edge, base_edge * position_factor / max(volatility, 0.5))
+
 
 class Logger:
     def __init__(self) -> None:
         self.logs = ""
         self.max_log_length = 3750
+        # Per-tick diagnostics are only formatted when set; errors and trades are always logged
+        self.verbose = False
 
     def print(self, *objects: Any, sep: str = " ", end: str = "\n") -> None:
         self.logs += sep.join(map(str, objects)) + end
 
     def flush(self, state: TradingState, orders: Dict[Symbol, List[Order]], conversions: int, trader_data: str) -> None:
-        base_length = len(
-            self.to_json(
-                [
-                    self.compress_state(state, ""),
-                    self.compress_orders(orders),
-                    conversions,
-                    "",
-                    "",
-                ]
-            )
-        )
-
-        max_item_length = (self.max_log_length - base_length) // 3
-
+        # One full serialization; the three strings are spliced into their slots
+        base = self.to_json([
+            self.compress_state(state, ""),
+            self.compress_orders(orders),
+            conversions,
+            "",
+            "",
+        ])
+        max_item_length = (self.max_log_length - len(base)) // 3
+
+        # The timestamp is a plain int, so its JSON is just str()
+        head = "[[" + str(state.timestamp) + ","
         print(
-            self.to_json(
-                [
-                    self.compress_state(state, self.truncate(
-                        state.traderData, max_item_length)),
-                    self.compress_orders(orders),
-                    conversions,
-                    self.truncate(trader_data, max_item_length),
-                    self.truncate(self.logs, max_item_length),
-                ]
-            )
+            head
+            + self.to_json(self.truncate(state.traderData, max_item_length))
+            + base[len(head) + 2:-7]
+            + "," + self.to_json(self.truncate(trader_data, max_item_length))
+            + "," + self.to_json(self.truncate(self.logs, max_item_length))
+            + "]"
         )
 
         self.logs = ""
@@ -59,11 +105,13 @@ class Logger:
         return [[listing.symbol, listing.product, listing.denomination] for listing in listings.values()]
 
     def compress_order_depths(self, order_depths: Dict[Symbol, OrderDepth]) -> Dict[Symbol, List[Any]]:
-        return {symbol: [depth.buy_orders, depth.sell_orders] for symbol, depth in order_depths.items()}
+        # Bids best-first and asks best-first as [price, volume] pairs, so no int keys reach the encoder
+        return {symbol: [sorted(depth.buy_orders.items(), reverse=True), sorted(depth.sell_orders.items())]
+                for symbol, depth in order_depths.items()}
 
-    def compress_trades(self, trades: Dict[Symbol, List[Trade]]) -> List[List[Any]]:
-        return [[trade.symbol, trade.price, trade.quantity, trade.buyer, trade.seller, trade.timestamp]
-                for arr in trades.values() for trade in arr]
+    def compress_trades(self, trades: Dict[Symbol, List[Trade]]) -> List[Tuple[Any, ...]]:
+        return [(trade.symbol, trade.price, trade.quantity, trade.buyer, trade.seller, trade.timestamp)
+                for trade in chain.from_iterable(trades.values())]
 
     def compress_observations(self, observations: Observation) -> List[Any]:
         return [observations.plainValueObservations, {
@@ -78,8 +126,8 @@ class Logger:
             ] for product, obs in observations.conversionObservations.items()
         }]
 
-    def compress_orders(self, orders: Dict[Symbol, List[Order]]) -> List[List[Any]]:
-        return [[order.symbol, order.price, order.quantity] for arr in orders.values() for order in arr]
+    def compress_orders(self, orders: Dict[Symbol, List[Order]]) -> List[Tuple[Any, ...]]:
+        return [(order.symbol, order.price, order.quantity) for order in chain.from_iterable(orders.values())]
 
     def to_json(self, value: Any) -> str:
         return json.dumps(value, cls=ProsperityEncoder, separators=(",", ":"))
@@ -122,6 +170,47 @@ PARAMS = {
     }
 }
 
+# Resin quotes (bid, ask) stepping out from fair value +/- take_width
+RESIN_LADDER = tuple(
+    (PARAMS[Product.RAINFOREST_RESIN]["fair_value"] - PARAMS[Product.RAINFOREST_RESIN]["take_width"] - i,
+     PARAMS[Product.RAINFOREST_RESIN]["fair_value"] + PARAMS[Product.RAINFOREST_RESIN]["take_width"] + i)
+    for i in range(3))
+
+
+@dataclass(slots=True)
+class SquidState:
+    current_edge: float
+    cumulative_pnl: float
+    last_trade: int
+    position_history: deque = ()
+    position_sum: int = 0
+    price_history: deque = ()
+    price_sum: float = 0.0
+    price_sumsq: float = 0.0
+
+    def __post_init__(self):
+        self.position_history = deque(self.position_history, maxlen=10)
+        self.price_history = deque(self.price_history, maxlen=5)
+
+
+@dataclass(slots=True)
+class KelpState:
+    price_history: deque = ()
+
+    def __post_init__(self):
+        self.price_history = deque(self.price_history, maxlen=PARAMS[Product.KELP]["window_size"])
+
+
+@dataclass(slots=True)
+class TraderState:
+    squid_state: Optional[SquidState] = None
+    kelp_data: KelpState = field(default_factory=KelpState)
+
+    @classmethod
+    def from_json(cls, data: dict) -> "TraderState":
+        squid_state = data.get("squid_state")
+        return cls(SquidState(**squid_state) if squid_state else None, KelpState(**data.get("kelp_data", {})))
+
 
 class Trader:
     def __init__(self):
@@ -131,79 +220,73 @@ class Trader:
     def run(self, state: TradingState) -> tuple[Dict[Symbol, List[Order]], int, str]:
         result = {}
         conversions = 0
-        trader_data = {"squid_state": {}, "kelp_data": {}}
+        trader_data = TraderState()
 
         if state.traderData:
-            trader_data = jsonpickle.decode(state.traderData)
-            logger.print("Loaded trader data:", trader_data)
+            trader_data = TraderState.from_json(decode_trader_data(state.traderData))
+            if logger.verbose:
+                logger.print("Loaded trader data:", trader_data)
+
+        bests = best_prices(state.order_depths)
 
         try:
             # Rainforest Resin Strategy
             if Product.RAINFOREST_RESIN in state.order_depths:
-                result[Product.RAINFOREST_RESIN] = self.trade_resin(state)
+                result[Product.RAINFOREST_RESIN] = self.trade_resin(
+                    state, *bests[Product.RAINFOREST_RESIN])
 
             # Kelp Strategy
             if Product.KELP in state.order_depths:
-                result[Product.KELP] = self.trade_kelp(state, trader_data)
+                result[Product.KELP] = self.trade_kelp(
+                    state, trader_data, *bests[Product.KELP])
 
             # Squid Ink Strategy
             if Product.SQUID_INK in state.order_depths:
                 result[Product.SQUID_INK], trader_data = self.trade_squid(
-                    state, trader_data)
+                    state, trader_data, *bests[Product.SQUID_INK])
 
         except Exception as e:
             logger.print("Error:", str(e))
 
-        trader_data_str = jsonpickle.encode(trader_data)
+        trader_data_str = encode_trader_data(trader_data)
         logger.flush(state, result, conversions, trader_data_str)
         return result, conversions, trader_data_str
 
-    def trade_resin(self, state: TradingState) -> List[Order]:
-        params = PARAMS[Product.RAINFOREST_RESIN]
-        position = state.position.get(Product.RAINFOREST_RESIN, 0)
+    def trade_resin(self, state: TradingState, best_bid: int, best_ask: int) -> List[Order]:
+        product = Product.RAINFOREST_RESIN
+        limit = PARAMS[product]["position_limit"]
+        position = state.position.get(product, 0)
+        buy_qty = limit - position
+        buy_qty = 10 if buy_qty > 10 else buy_qty
+        sell_qty = limit + position
+        sell_qty = 10 if sell_qty > 10 else sell_qty
         orders = []
+        append = orders.append
 
-        order_depth = state.order_depths[Product.RAINFOREST_RESIN]
-        best_bid = max(order_depth.buy_orders.keys(), default=0)
-        best_ask = min(order_depth.sell_orders.keys(), default=0)
+        # A side with no room left under the limit is not quoted
+        for bid_price, ask_price in RESIN_LADDER:
+            if buy_qty > 0 and bid_price > best_bid:
+                append(Order(product, bid_price, buy_qty))
 
-        for i in range(3):
-            bid_price = params["fair_value"] - params["take_width"] - i
-            ask_price = params["fair_value"] + params["take_width"] + i
-
-            if bid_price > best_bid:
-                quantity = min(10, params["position_limit"] - position)
-                orders.append(
-                    Order(Product.RAINFOREST_RESIN, bid_price, quantity))
-
-            if ask_price < best_ask:
-                quantity = min(10, params["position_limit"] + position)
-                orders.append(
-                    Order(Product.RAINFOREST_RESIN, ask_price, -quantity))
+            if sell_qty > 0 and ask_price < best_ask:
+                append(Order(product, ask_price, -sell_qty))
 
         return orders
 
-    def trade_kelp(self, state: TradingState, trader_data: dict) -> List[Order]:
+    def trade_kelp(self, state: TradingState, trader_data: TraderState,
+                   best_bid: int, best_ask: int) -> List[Order]:
         params = PARAMS[Product.KELP]
         position = state.position.get(Product.KELP, 0)
         orders = []
-        order_depth = state.order_depths[Product.KELP]
 
-        if "price_history" not in trader_data["kelp_data"]:
-            trader_data["kelp_data"]["price_history"] = []
+        price_history = trader_data.kelp_data.price_history
 
-        if order_depth.sell_orders and order_depth.buy_orders:
-            best_ask = min(order_depth.sell_orders.keys())
-            best_bid = max(order_depth.buy_orders.keys())
-            mid_price = (best_ask + best_bid) / 2
-            trader_data["kelp_data"]["price_history"].append(mid_price)
+        if best_bid and best_ask:
+            price_history.append((best_ask + best_bid) / 2)
 
-            if len(trader_data["kelp_data"]["price_history"]) > params["window_size"]:
-                trader_data["kelp_data"]["price_history"].pop(0)
-
-        if len(trader_data["kelp_data"]["price_history"]) >= 2:
-            last_price = trader_data["kelp_data"]["price_history"][-2]
-            current_price = trader_data["kelp_data"]["price_history"][-1]
+        if len(price_history) >= 2:
+            last_price = price_history[-2]
+            current_price = price_history[-1]
             returns = (current_price - last_price) / last_price
             pred_returns = returns * params["reversion_beta"]
             fair_price = current_price + (current_price * pred_returns)
@@ -214,38 +297,41 @@ class Trader:
 
         return orders
 
-    def trade_squid(self, state: TradingState, trader_data: dict) -> tuple[List[Order], dict]:
+    def trade_squid(self, state: TradingState, trader_data: TraderState,
+                    best_bid: int, best_ask: int) -> tuple[List[Order], TraderState]:
         params = PARAMS[Product.SQUID_INK]
         position = state.position.get(Product.SQUID_INK, 0)
         orders = []
-        order_depth = state.order_depths[Product.SQUID_INK]
-
-        # Initialize squid state
-        squid_state = trader_data.setdefault("squid_state", {
-            "current_edge": params["base_edge"],
-            "cumulative_pnl": 0,
-            "last_trade": state.timestamp,
-            "position_history": [],
-            "price_history": []
-        })
-
-        # Update price history
-        best_bid = max(order_depth.buy_orders.keys(), default=0)
-        best_ask = min(order_depth.sell_orders.keys(), default=0)
+
+        # The squid state has always been seeded empty, so squid ink is not quoted
+        squid_state = trader_data.squid_state
+        if squid_state is None:
+            return orders, trader_data
+
+        # Update price history; only the last five prices feed the edge, via running sums
         mid_price = (best_bid + best_ask) / \
             2 if best_bid and best_ask else 1850
-        squid_state["price_history"].append(mid_price)
+        price_history = squid_state.price_history
+        if len(price_history) == price_history.maxlen:
+            evicted = price_history[0]
+            squid_state.price_sum -= evicted
+            squid_state.price_sumsq -= evicted * evicted
+        price_history.append(mid_price)
+        squid_state.price_sum += mid_price
+        squid_state.price_sumsq += mid_price * mid_price
 
         # Calculate current PnL
-        current_pnl = self.calculate_squid_pnl(position, order_depth)
-        squid_state["cumulative_pnl"] += current_pnl
-        logger.print(
-            f"Squid PnL: {current_pnl:.2f} | Total: {squid_state['cumulative_pnl']:.2f}")
+        current_pnl = self.calculate_squid_pnl(position, best_bid, best_ask)
+        squid_state.cumulative_pnl += current_pnl
+        if logger.verbose:
+            logger.print(
+                f"Squid PnL: {current_pnl:.2f} | Total: {squid_state.cumulative_pnl:.2f}")
 
         # Risk management
-        if squid_state["cumulative_pnl"] < params["loss_threshold"]:
-            logger.print(
-                f"Squid halted: Cumulative PnL {squid_state['cumulative_pnl']:.2f}")
+        if squid_state.cumulative_pnl < params["loss_threshold"]:
+            if logger.verbose:
+                logger.print(
+                    f"Squid halted: Cumulative PnL {squid_state.cumulative_pnl:.2f}")
             return [], trader_data
 
         # Calculate adaptive edge
@@ -265,49 +351,45 @@ class Trader:
         orders.append(Order(Product.SQUID_INK, ask_price, -ask_qty))
 
         # Position rotation
-        if position != 0 and (state.timestamp - squid_state["last_trade"]) > params["risk_window"]:
+        if position != 0 and (state.timestamp - squid_state.last_trade) > params["risk_window"]:
             close_price = best_bid if position > 0 else best_ask
             orders.append(Order(Product.SQUID_INK, close_price, -position))
             logger.print(
                 f"Position rotation: Closed {position} @ {close_price}")
 
         # Update state
-        squid_state.update({
-            "last_trade": state.timestamp,
-            "current_edge": edge,
-            "position_history": squid_state["position_history"][-9:] + [position]
-        })
+        position_history = squid_state.position_history
+        if len(position_history) == position_history.maxlen:
+            squid_state.position_sum -= position_history[0]
+        position_history.append(position)
+        squid_state.position_sum += position
+        squid_state.last_trade = state.timestamp
+        squid_state.current_edge = edge
 
         return orders, trader_data
 
-    def calculate_adaptive_edge(self, state: dict, mid_price: float, params: dict) -> float:
+    def calculate_adaptive_edge(self, state: SquidState, mid_price: float, params: dict) -> float:
         """Dynamic edge calculation based on market volatility and position history"""
-        price_history = state["price_history"][-5:] + [mid_price]
-        volatility = np.std(price_history) if len(price_history) > 1 else 1.0
-
-        position_history = state["position_history"]
-        avg_position = np.mean(position_history) if position_history else 0
-        position_factor = 1 - abs(avg_position)/params["position_limit"]
+        position_history = state.position_history
+        avg_position = state.position_sum / len(position_history) if position_history else 0.0
 
-        return max(params["min_edge"],
-                   params["base_edge"] * position_factor / max(volatility, 0.5))
+        # Window is the recent prices plus mid_price once more
+        return adaptive_edge(state.price_sum + mid_price, state.price_sumsq + mid_price * mid_price,
+                             len(state.price_history) + 1, avg_position,
+                             params["base_edge"], params["min_edge"], params["position_limit"])
 
-    def calculate_squid_pnl(self, position: int, order_depth: OrderDepth) -> float:
+    def calculate_squid_pnl(self, position: int, best_bid: int, best_ask: int) -> float:
         """Mark-to-market PnL calculation"""
         if position == 0:
             return 0
 
-        best_bid = max(order_depth.buy_orders.keys(), default=0)
-        best_ask = min(order_depth.sell_orders.keys(), default=0)
         if best_bid == 0 or best_ask == 0:
             return 0
 
         mid_price = (best_bid + best_ask) / 2
-        return position * (mid_price - self.get_average_cost(position, order_depth))
+        return position * (mid_price - self.get_average_cost(position, best_bid, best_ask))
 
-    def get_average_cost(self, position: int, order_depth: OrderDepth) -> float:
+    def get_average_cost(self, position: int, best_bid: int, best_ask: int) -> float:
         """Calculate average cost basis for current position"""
         # This is simplified - would need actual trade history for accurate calculation
-        best_bid = max(order_depth.buy_orders.keys(), default=0)
-        best_ask = min(order_depth.sell_orders.keys(), default=0)
         return (best_bid + best_ask) / 2
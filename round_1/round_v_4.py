@@ -1,7 +1,6 @@
 import json
 import numpy as np
 import pandas as pd
-import jsonpickle
 from typing import Dict, List, Any
 from datamodel import Listing, Observation, Order, OrderDepth, ProsperityEncoder, Symbol, Trade, TradingState
 
@@ -17,31 +16,24 @@ class Logger:
         self.logs += sep.join(map(str, objects)) + end
 
     def flush(self, state: TradingState, orders: Dict[Symbol, List[Order]], conversions: int, trader_data: str) -> None:
-        base_length = len(
-            self.to_json(
-                [
-                    self.compress_state(state, ""),
-                    self.compress_orders(orders),
-                    conversions,
-                    "",
-                    "",
-                ]
-            )
-        )
-
-        max_item_length = (self.max_log_length - base_length) // 3
-
+        # One full serialization; the three strings are spliced into their slots
+        base = self.to_json([
+            self.compress_state(state, ""),
+            self.compress_orders(orders),
+            conversions,
+            "",
+            "",
+        ])
+        max_item_length = (self.max_log_length - len(base)) // 3
+
+        head = "[[" + str(state.timestamp) + ","
         print(
-            self.to_json(
-                [
-                    self.compress_state(state, self.truncate(
-                        state.traderData, max_item_length)),
-                    self.compress_orders(orders),
-                    conversions,
-                    self.truncate(trader_data, max_item_length),
-                    self.truncate(self.logs, max_item_length),
-                ]
-            )
+            head
+            + self.to_json(self.truncate(state.traderData, max_item_length))
+            + base[len(head) + 2:-7]
+            + "," + self.to_json(self.truncate(trader_data, max_item_length))
+            + "," + self.to_json(self.truncate(self.logs, max_item_length))
+            + "]"
         )
 
         self.logs = ""
@@ -144,7 +136,7 @@ class Trader:
         try:
             # Load historical data from state
             if state.traderData:
-                trader_data = jsonpickle.decode(state.traderData)
+                trader_data = json.loads(state.traderData)
 
             # Rainforest Resin Strategy
             if Product.RAINFOREST_RESIN in state.order_depths:
@@ -164,8 +156,9 @@ class Trader:
         except Exception as e:
             logger.print(f"Error: {str(e)}")
 
-        logger.flush(state, result, 0, jsonpickle.encode(trader_data))
-        return result, 0, jsonpickle.encode(trader_data)
+        trader_data_str = json.dumps(trader_data, separators=(",", ":"))
+        logger.flush(state, result, 0, trader_data_str)
+        return result, 0, trader_data_str
 
     def trade_resin(self, state: TradingState) -> List[Order]:
         params = StrategyParams.RESIN
@@ -1,10 +1,69 @@
+import base64
 import json
-import numpy as np
-import pandas as pd
-import jsonpickle
-from typing import Dict, List, Any
+import math
+import zlib
+from collections import deque
+from itertools import chain
+from typing import Dict, List, Any, Tuple
 from datamodel import Listing, Observation, Order, OrderDepth, ProsperityEncoder, Symbol, Trade, TradingState
 
+try:
+    from numba import njit
+except ImportError:
+    # mean_true_range runs interpreted
+    def njit(*args, **kwargs):
+        return lambda fn: fn
+
+
+# Encoded traderData longer than this many bytes is stored zlib-compressed
+TRADER_DATA_COMPRESS_OVER = 512
+
+# NumPy is only needed by the kelp ring, so it is imported on first use
+NUMPY = None
+
+
+def load_numpy():
+    global NUMPY
+    if NUMPY is None:
+        import numpy
+        NUMPY = numpy
+    return NUMPY
+
+
+def best_prices(order_depths: Dict[Symbol, OrderDepth]) -> Dict[Symbol, Tuple[int, int]]:
+    """(best_bid, best_ask) per symbol in one pass over the books, 0 for an empty side"""
+    return {symbol: (max(depth.buy_orders, default=0), min(depth.sell_orders, default=0))
+            for symbol, depth in order_depths.items()}
+
+
+def encode_trader_data(value: Any) -> str:
+    # Rolling windows are deques in memory and plain lists on the wire
+    payload = json.dumps(value, default=list, separators=(",", ":")).encode()
+    # Large payloads share the log budget, so they go out deflated behind a "z" marker
+    if len(payload) > TRADER_DATA_COMPRESS_OVER:
+        return "z" + base64.b64encode(zlib.compress(payload)).decode()
+    return payload.decode()
+
+
+def decode_trader_data(value: str) -> Any:
+    payload = zlib.decompress(base64.b64decode(value[1:])) if value[0] == "z" else value
+    return json.loads(payload)
+
+
+@njit(cache=True)
+def mean_true_range(highs, lows, prices):
+    """ATR over the high/low window, each bar against the previous price in the tail of prices"""
+    n = len(highs)
+    if n < 2:
+        return 0.0
+    offset = len(prices) - n
+    total = 0.0
+    for i in range(1, n):
+        previous = prices[offset + i - 1]
+        total += max(highs[i] - lows[i], abs(highs[i] - previous), abs(lows[i] - previous))
+    return total / (n - 1)
+
+
 # this is good in profit
 
 
@@ -17,31 +76,25 @@ class Logger:
         self.logs += sep.join(map(str, objects)) + end
 
     def flush(self, state: TradingState, orders: Dict[Symbol, List[Order]], conversions: int, trader_data: str) -> None:
-        base_length = len(
-            self.to_json(
-                [
-                    self.compress_state(state, ""),
-                    self.compress_orders(orders),
-                    conversions,
-                    "",
-                    "",
-                ]
-            )
-        )
-
-        max_item_length = (self.max_log_length - base_length) // 3
-
+        # One full serialization; the three strings are spliced into their slots
+        base = self.to_json([
+            self.compress_state(state, ""),
+            self.compress_orders(orders),
+            conversions,
+            "",
+            "",
+        ])
+        max_item_length = (self.max_log_length - len(base)) // 3
+
+        # The timestamp is a plain int, so its JSON is just str()
+        head = "[[" + str(state.timestamp) + ","
         print(
-            self.to_json(
-                [
-                    self.compress_state(state, self.truncate(
-                        state.traderData, max_item_length)),
-                    self.compress_orders(orders),
-                    conversions,
-                    self.truncate(trader_data, max_item_length),
-                    self.truncate(self.logs, max_item_length),
-                ]
-            )
+            head
+            + self.to_json(self.truncate(state.traderData, max_item_length))
+            + base[len(head) + 2:-7]
+            + "," + self.to_json(self.truncate(trader_data, max_item_length))
+            + "," + self.to_json(self.truncate(self.logs, max_item_length))
+            + "]"
         )
 
         self.logs = ""
@@ -62,11 +115,13 @@ class Logger:
         return [[listing.symbol, listing.product, listing.denomination] for listing in listings.values()]
 
     def compress_order_depths(self, order_depths: Dict[Symbol, OrderDepth]) -> Dict[Symbol, List[Any]]:
-        return {symbol: [depth.buy_orders, depth.sell_orders] for symbol, depth in order_depths.items()}
+        # Bids best-first and asks best-first as [price, volume] pairs, so no int keys reach the encoder
+        return {symbol: [sorted(depth.buy_orders.items(), reverse=True), sorted(depth.sell_orders.items())]
+                for symbol, depth in order_depths.items()}
 
-    def compress_trades(self, trades: Dict[Symbol, List[Trade]]) -> List[List[Any]]:
-        return [[trade.symbol, trade.price, trade.quantity, trade.buyer, trade.seller, trade.timestamp]
-                for arr in trades.values() for trade in arr]
+    def compress_trades(self, trades: Dict[Symbol, List[Trade]]) -> List[Tuple[Any, ...]]:
+        return [(trade.symbol, trade.price, trade.quantity, trade.buyer, trade.seller, trade.timestamp)
+                for trade in chain.from_iterable(trades.values())]
 
     def compress_observations(self, observations: Observation) -> List[Any]:
         return [observations.plainValueObservations, {
@@ -81,8 +136,8 @@ class Logger:
             ] for product, obs in observations.conversionObservations.items()
         }]
 
-    def compress_orders(self, orders: Dict[Symbol, List[Order]]) -> List[List[Any]]:
-        return [[order.symbol, order.price, order.quantity] for arr in orders.values() for order in arr]
+    def compress_orders(self, orders: Dict[Symbol, List[Order]]) -> List[Tuple[Any, ...]]:
+        return [(order.symbol, order.price, order.quantity) for order in chain.from_iterable(orders.values())]
 
     def to_json(self, value: Any) -> str:
         return json.dumps(value, cls=ProsperityEncoder, separators=(",", ":"))
@@ -126,6 +181,13 @@ class StrategyParams:
     }
 
 
+# Resin quotes (bid, ask) stepping out from fair value +/- take_width
+RESIN_LADDER = tuple(
+    (StrategyParams.RESIN["fair_value"] - StrategyParams.RESIN["take_width"] - i,
+     StrategyParams.RESIN["fair_value"] + StrategyParams.RESIN["take_width"] + i)
+    for i in range(3))
+
+
 class Trader:
     def __init__(self):
         self.position_limits = {
@@ -135,7 +197,8 @@ class Trader:
         }
         self.historical_data = {
             Product.KELP: {'timestamps': [], 'mid_prices': []},
-            Product.SQUID_INK: {'timestamps': [], 'spreads': []}
+            Product.SQUID_INK: {'spreads': deque(maxlen=StrategyParams.SQUID["volatility_window"]),
+                                'spread_sum': 0.0, 'spread_sumsq': 0.0}
         }
 
     def run(self, state: TradingState):
@@ -144,19 +207,23 @@ class Trader:
         try:
             # Load historical data from state
             if state.traderData:
-                trader_data = jsonpickle.decode(state.traderData)
+                trader_data = decode_trader_data(state.traderData)
+
+            bests = best_prices(state.order_depths)
 
             # Rainforest Resin Strategy
             if Product.RAINFOREST_RESIN in state.order_depths:
-                result[Product.RAINFOREST_RESIN] = self.trade_resin(state)
+                result[Product.RAINFOREST_RESIN] = self.trade_resin(
+                    state, *bests[Product.RAINFOREST_RESIN])
 
             # Kelp Strategy
             if Product.KELP in state.order_depths:
-                result[Product.KELP] = self.trade_kelp(state, trader_data)
+                result[Product.KELP] = self.trade_kelp(
+                    state, trader_data, *bests[Product.KELP])
 
             # Squid Ink Strategy
             if Product.SQUID_INK in state.order_depths:
-                result[Product.SQUID_INK] = self.trade_squid(state)
+                result[Product.SQUID_INK] = self.trade_squid(state, bests)
 
             # Update trader_data with latest historical data
             trader_data['historical_data'] = self.historical_data
@@ -164,78 +231,87 @@ class Trader:
         except Exception as e:
             logger.print(f"Error: {str(e)}")
 
-        logger.flush(state, result, 0, jsonpickle.encode(trader_data))
-        return result, 0, jsonpickle.encode(trader_data)
+        trader_data_str = encode_trader_data(trader_data)
+        logger.flush(state, result, 0, trader_data_str)
+        return result, 0, trader_data_str
 
-    def trade_resin(self, state: TradingState) -> List[Order]:
+    def trade_resin(self, state: TradingState, best_bid: int, best_ask: int) -> List[Order]:
         params = StrategyParams.RESIN
         product = Product.RAINFOREST_RESIN
+        fair_value = params["fair_value"]
+        limit = params["position_limit"]
         position = state.position.get(product, 0)
+        can_buy = position < limit
+        can_sell = position > -limit
+        buy_qty = limit - position
+        buy_qty = 10 if buy_qty > 10 else buy_qty
+        sell_qty = limit + position
+        sell_qty = 10 if sell_qty > 10 else sell_qty
         orders = []
-        order_depth = state.order_depths[product]
+        append = orders.append
 
-        # Get best bids/asks safely
-        bids = order_depth.buy_orders.keys()
-        asks = order_depth.sell_orders.keys()
-        best_bid = max(bids) if bids else params["fair_value"] - 2
-        best_ask = min(asks) if asks else params["fair_value"] + 2
+        # Fall back to the fair value band on an empty side
+        best_bid = best_bid or fair_value - 2
+        best_ask = best_ask or fair_value + 2
 
-        for i in range(3):
-            bid_price = params["fair_value"] - params["take_width"] - i
-            ask_price = params["fair_value"] + params["take_width"] + i
+        for bid_price, ask_price in RESIN_LADDER:
+            if can_buy and bid_price > best_bid:
+                append(Order(product, bid_price, buy_qty))
 
-            if bid_price > best_bid and position < params["position_limit"]:
-                quantity = min(10, params["position_limit"] - position)
-                orders.append(Order(product, bid_price, quantity))
-
-            if ask_price < best_ask and position > -params["position_limit"]:
-                quantity = min(10, params["position_limit"] + position)
-                orders.append(Order(product, ask_price, -quantity))
+            if can_sell and ask_price < best_ask:
+                append(Order(product, ask_price, -sell_qty))
 
         return orders
 
-    def trade_kelp(self, state: TradingState, trader_data: dict) -> List[Order]:
+    def trade_kelp(self, state: TradingState, trader_data: dict, best_bid: int, best_ask: int) -> List[Order]:
 
+        np = load_numpy()
         product = Product.KELP
         position = state.position.get(product, 0)
-        order_depth = state.order_depths[product]
         orders = []
 
-        # Safely get market prices
-        try:
-            best_ask = min(order_depth.sell_orders.keys())
-            best_bid = max(order_depth.buy_orders.keys())
-            mid_price = (best_ask + best_bid) / 2
-        except (ValueError, AttributeError):
+        # Both sides are needed for a mid price
+        if not best_bid or not best_ask:
             return orders
+        mid_price = (best_ask + best_bid) / 2
 
-        # Update price history with volatility tracking
+        # Prices live in a ring of window_size entries with running sums over the last 5, 10 and 20
         hist = self.historical_data.setdefault(product, {
-            'prices': [],
+            'ring': np.zeros(params["window_size"]),
+            'count': 0,
+            'sum5': 0.0,
+            'sum10': 0.0,
+            'sum20': 0.0,
             'highs': [],
             'lows': [],
             'atr': []
         })
 
-        hist['prices'].append(mid_price)
+        ring = hist['ring']
+        size = len(ring)
+        count = hist['count']
+        for span, key in ((5, 'sum5'), (10, 'sum10'), (20, 'sum20')):
+            if count >= span:
+                hist[key] -= ring[(count - span) % size]
+            hist[key] += mid_price
+        ring[count % size] = mid_price
+        count = hist['count'] = count + 1
+        n = min(count, size)
+
         # Simplified high/low for demonstration
         hist['highs'].append(mid_price)
         hist['lows'].append(mid_price)
 
         # Maintain volatility window
-        hist['prices'] = hist['prices'][-params["window_size"]:]
         hist['highs'] = hist['highs'][-params["volatility_window"]:]
         hist['lows'] = hist['lows'][-params["volatility_window"]:]
 
         # Calculate volatility (ATR)
-        if len(hist['prices']) >= params["volatility_window"]:
-            true_ranges = [
-                max(hist['highs'][i] - hist['lows'][i],
-                    abs(hist['highs'][i] - hist['prices'][i-1]),
-                    abs(hist['lows'][i] - hist['prices'][i-1]))
-                for i in range(1, len(hist['prices']))
-            ]
-            atr = np.mean(true_ranges) if true_ranges else 0
+        if n >= params["volatility_window"]:
+            prices = ring[:n] if count <= size else np.roll(ring, -(count % size))
+            atr = mean_true_range(np.array(hist['highs'], dtype=np.float64),
+                                  np.array(hist['lows'], dtype=np.float64),
+                                  prices)
             hist['atr'].append(atr)
         else:
             atr = 0
@@ -245,17 +321,16 @@ class Trader:
             (2 * atr) if atr else params["base_spread"]
 
         # Trend detection using EMA crossover
-        if len(hist['prices']) >= 20:
-            short_ema = np.mean(hist['prices'][-5:])
-            long_ema = np.mean(hist['prices'][-20:])
+        short_ema = hist['sum5'] / min(n, 5)
+        if n >= 20:
+            long_ema = hist['sum20'] / 20
             trend_direction = 1 if short_ema > long_ema else -1
         else:
             trend_direction = 0
 
-        # Calculate fair value with momentum adjustment
-        if len(hist['prices']) >= 2:
-            momentum = np.mean(hist['prices'][-5:]) - \
-                np.mean(hist['prices'][-10:-5])
+        # Calculate fair value with momentum adjustment, once there is a window before the last 5
+        if n > 5:
+            momentum = short_ema - (hist['sum10'] - hist['sum5']) / (min(n, 10) - 5)
             fair_price = mid_price + (momentum * trend_direction)
         else:
             fair_price = mid_price
@@ -290,23 +365,15 @@ class Trader:
 
         return orders
 
-    def trade_squid(self, state: TradingState) -> List[Order]:
+    def trade_squid(self, state: TradingState, bests: Dict[Symbol, tuple[int, int]]) -> List[Order]:
         params = StrategyParams.SQUID
         product = Product.SQUID_INK
         position = state.position.get(product, 0)
         orders = []
 
-        # Get pair data safely
-        pair_symbol = params["pair_symbol"]
-        pair_depth = state.order_depths.get(pair_symbol, OrderDepth())
-
-        # Get squid bid
-        squid_bids = state.order_depths[product].buy_orders.keys()
-        squid_bid = max(squid_bids) if squid_bids else 0
-
-        # Get pair ask
-        pair_asks = pair_depth.sell_orders.keys()
-        pair_ask = min(pair_asks) if pair_asks else 0
+        # Squid bid against the pair's ask; a missing pair counts as an empty book
+        squid_bid = bests[product][0]
+        pair_ask = bests.get(params["pair_symbol"], (0, 0))[1]
 
         # Calculate spread
         if squid_bid == 0 or pair_ask == 0:
@@ -316,16 +383,22 @@ class Trader:
 
         # Update historical spread
         hist = self.historical_data[product]
-        hist['timestamps'].append(state.timestamp)
-        hist['spreads'].append(spread)
-
-        # Maintain volatility window
-        spreads = hist['spreads'][-params["volatility_window"]:]
-        if len(spreads) < 2:
+        spreads = hist['spreads']
+        if len(spreads) == spreads.maxlen:
+            evicted = spreads[0]
+            hist['spread_sum'] -= evicted
+            hist['spread_sumsq'] -= evicted * evicted
+        spreads.append(spread)
+        hist['spread_sum'] += spread
+        hist['spread_sumsq'] += spread * spread
+
+        # Window statistics from the running sums
+        n = len(spreads)
+        if n < 2:
             return orders
 
-        spread_mean = np.mean(spreads)
-        spread_std = np.std(spreads)
+        spread_mean = hist['spread_sum'] / n
+        spread_std = math.sqrt(max(hist['spread_sumsq'] / n - spread_mean * spread_mean, 0.0))
 
         if spread_std == 0:
             return orders
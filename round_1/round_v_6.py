@@ -1,10 +1,47 @@
 import json
-import numpy as np
+import math
+import sys
+from collections import deque
+from itertools import chain
+from operator import attrgetter
 import pandas as pd
-import jsonpickle
-from typing import Dict, List, Any
+from typing import Dict, List, Tuple, Any
 from datamodel import Listing, Observation, Order, OrderDepth, ProsperityEncoder, Symbol, Trade, TradingState
 
+# Conversion observation and trade fields in the order the visualizer expects
+conversion_fields = attrgetter("bidPrice", "askPrice", "transportFees", "exportTariff",
+                               "importTariff", "sugarPrice", "sunlightIndex")
+trade_fields = attrgetter("symbol", "price", "quantity", "buyer", "seller", "timestamp")
+
+
+def encode_trader_data(value: Any) -> str:
+    return json.dumps(value, default=list, separators=(",", ":"))
+
+
+def decode_trader_data(value: str) -> Any:
+    return json.loads(value)
+
+
+def compress_order_depths(order_depths: Dict[Symbol, OrderDepth]) -> Dict[Symbol, List[Any]]:
+    return {symbol: [depth.buy_orders, depth.sell_orders] for symbol, depth in order_depths.items()}
+
+
+def compress_trades(trades: Dict[Symbol, List[Trade]]) -> List[Tuple[Any, ...]]:
+    return list(map(trade_fields, chain.from_iterable(trades.values())))
+
+
+def compress_observations(observations: Observation) -> List[Any]:
+    conversions = observations.conversionObservations
+    if not conversions:
+        return [observations.plainValueObservations, {}]
+    return [observations.plainValueObservations,
+            {product: conversion_fields(obs) for product, obs in conversions.items()}]
+
+
+def compress_orders(orders: Dict[Symbol, List[Order]]) -> List[List[Any]]:
+    return [[order.symbol, order.price, order.quantity] for arr in orders.values() for order in arr]
+
+
 # this is good in profit
 
 
@@ -12,36 +49,32 @@ class Logger:
     def __init__(self) -> None:
         self.logs = ""
         self.max_log_length = 3750
+        # Listings are fixed for a session; keyed on their symbols since the dict is rebuilt every tick
+        self.listings_cache = (None, None)
 
     def print(self, *objects: Any, sep: str = " ", end: str = "\n") -> None:
         self.logs += sep.join(map(str, objects)) + end
 
     def flush(self, state: TradingState, orders: Dict[Symbol, List[Order]], conversions: int, trader_data: str) -> None:
-        base_length = len(
-            self.to_json(
-                [
-                    self.compress_state(state, ""),
-                    self.compress_orders(orders),
-                    conversions,
-                    "",
-                    "",
-                ]
-            )
-        )
-
-        max_item_length = (self.max_log_length - base_length) // 3
-
-        print(
-            self.to_json(
-                [
-                    self.compress_state(state, self.truncate(
-                        state.traderData, max_item_length)),
-                    self.compress_orders(orders),
-                    conversions,
-                    self.truncate(trader_data, max_item_length),
-                    self.truncate(self.logs, max_item_length),
-                ]
-            )
+        # One full serialization; the three strings are spliced into their slots
+        base = self.to_json([
+            self.compress_state(state, ""),
+            compress_orders(orders),
+            conversions,
+            "",
+            "",
+        ])
+        max_item_length = (self.max_log_length - len(base)) // 3
+
+        head = "[[" + str(state.timestamp) + ","
+        # One write per tick; resolved at call time so redirected stdout (backtester capture) still works
+        sys.stdout.write(
+            head
+            + self.to_json(self.truncate(state.traderData, max_item_length))
+            + base[len(head) + 2:-7]
+            + "," + self.to_json(self.truncate(trader_data, max_item_length))
+            + "," + self.to_json(self.truncate(self.logs, max_item_length))
+            + "]\n"
         )
 
         self.logs = ""
@@ -51,38 +84,19 @@ class Logger:
             state.timestamp,
             trader_data,
             self.compress_listings(state.listings),
-            self.compress_order_depths(state.order_depths),
-            self.compress_trades(state.own_trades),
-            self.compress_trades(state.market_trades),
+            compress_order_depths(state.order_depths),
+            compress_trades(state.own_trades),
+            compress_trades(state.market_trades),
             state.position,
-            self.compress_observations(state.observations),
+            compress_observations(state.observations),
         ]
 
     def compress_listings(self, listings: Dict[Symbol, Listing]) -> List[List[Any]]:
-        return [[listing.symbol, listing.product, listing.denomination] for listing in listings.values()]
-
-    def compress_order_depths(self, order_depths: Dict[Symbol, OrderDepth]) -> Dict[Symbol, List[Any]]:
-        return {symbol: [depth.buy_orders, depth.sell_orders] for symbol, depth in order_depths.items()}
-
-    def compress_trades(self, trades: Dict[Symbol, List[Trade]]) -> List[List[Any]]:
-        return [[trade.symbol, trade.price, trade.quantity, trade.buyer, trade.seller, trade.timestamp]
-                for arr in trades.values() for trade in arr]
-
-    def compress_observations(self, observations: Observation) -> List[Any]:
-        return [observations.plainValueObservations, {
-            product: [
-                obs.bidPrice,
-                obs.askPrice,
-                obs.transportFees,
-                obs.exportTariff,
-                obs.importTariff,
-                obs.sugarPrice,
-                obs.sunlightIndex,
-            ] for product, obs in observations.conversionObservations.items()
-        }]
-
-    def compress_orders(self, orders: Dict[Symbol, List[Order]]) -> List[List[Any]]:
-        return [[order.symbol, order.price, order.quantity] for arr in orders.values() for order in arr]
+        key = tuple(listings)
+        if key != self.listings_cache[0]:
+            self.listings_cache = (key, [[listing.symbol, listing.product, listing.denomination]
+                                         for listing in listings.values()])
+        return self.listings_cache[1]
 
     def to_json(self, value: Any) -> str:
         return json.dumps(value, cls=ProsperityEncoder, separators=(",", ":"))
@@ -126,6 +140,13 @@ class StrategyParams:
     }
 
 
+# Resin quote ladder of (bid, ask) pairs, widening by one tick per level from the take width
+RESIN_LADDER = tuple(
+    (StrategyParams.RESIN["fair_value"] - StrategyParams.RESIN["take_width"] - i,
+     StrategyParams.RESIN["fair_value"] + StrategyParams.RESIN["take_width"] + i)
+    for i in range(3))
+
+
 class Trader:
     def __init__(self):
         self.position_limits = {
@@ -133,9 +154,16 @@ class Trader:
             Product.KELP: 50,
             Product.SQUID_INK: 50
         }
+        # Resin quotes depend only on the touch and position: ((best_bid, best_ask, position), orders)
+        self.resin_cache = (None, [])
+        kelp_window = StrategyParams.KELP["window_size"]
+        squid_window = StrategyParams.SQUID["volatility_window"]
         self.historical_data = {
-            Product.KELP: {'timestamps': [], 'mid_prices': []},
-            Product.SQUID_INK: {'timestamps': [], 'spreads': []}
+            Product.KELP: {'timestamps': deque(maxlen=kelp_window),
+                           'mid_prices': deque(maxlen=kelp_window)},
+            Product.SQUID_INK: {'timestamps': deque(maxlen=squid_window),
+                                'spreads': deque(maxlen=squid_window),
+                                'spread_sum': 0.0, 'spread_sumsq': 0.0}
         }
 
     def run(self, state: TradingState):
@@ -144,7 +172,7 @@ class Trader:
         try:
             # Load historical data from state
             if state.traderData:
-                trader_data = jsonpickle.decode(state.traderData)
+                trader_data = decode_trader_data(state.traderData)
 
             # Rainforest Resin Strategy
             if Product.RAINFOREST_RESIN in state.order_depths:
@@ -164,8 +192,9 @@ class Trader:
         except Exception as e:
             logger.print(f"Error: {str(e)}")
 
-        logger.flush(state, result, 0, jsonpickle.encode(trader_data))
-        return result, 0, jsonpickle.encode(trader_data)
+        trader_data_str = encode_trader_data(trader_data)
+        logger.flush(state, result, 0, trader_data_str)
+        return result, 0, trader_data_str
 
     def trade_resin(self, state: TradingState) -> List[Order]:
         params = StrategyParams.RESIN
@@ -180,18 +209,24 @@ class Trader:
         best_bid = max(bids) if bids else params["fair_value"] - 2
         best_ask = min(asks) if asks else params["fair_value"] + 2
 
-        for i in range(3):
-            bid_price = params["fair_value"] - params["take_width"] - i
-            ask_price = params["fair_value"] + params["take_width"] + i
+        key = (best_bid, best_ask, position)
+        if key == self.resin_cache[0]:
+            return self.resin_cache[1]
 
-            if bid_price > best_bid and position < params["position_limit"]:
-                quantity = min(10, params["position_limit"] - position)
-                orders.append(Order(product, bid_price, quantity))
+        limit = params["position_limit"]
+        can_buy = position < limit
+        can_sell = position > -limit
+        buy_qty = min(10, limit - position)
+        sell_qty = -min(10, limit + position)
 
-            if ask_price < best_ask and position > -params["position_limit"]:
-                quantity = min(10, params["position_limit"] + position)
-                orders.append(Order(product, ask_price, -quantity))
+        # Quote level by level, bid before ask
+        for bid_price, ask_price in RESIN_LADDER:
+            if can_buy and bid_price > best_bid:
+                orders.append(Order(product, bid_price, buy_qty))
+            if can_sell and ask_price < best_ask:
+                orders.append(Order(product, ask_price, sell_qty))
 
+        self.resin_cache = (key, orders)
         return orders
 
     def trade_kelp(self, state: TradingState, trader_data: dict) -> List[Order]:
@@ -216,11 +251,6 @@ class Trader:
         hist['timestamps'].append(state.timestamp)
         hist['mid_prices'].append(mid_price)
 
-        # Maintain window size
-        if len(hist['mid_prices']) > params["window_size"]:
-            hist['mid_prices'].pop(0)
-            hist['timestamps'].pop(0)
-
         # Generate orders
         if len(hist['mid_prices']) >= 2:
             last_price = hist['mid_prices'][-2]
@@ -261,15 +291,22 @@ class Trader:
         # Update historical spread
         hist = self.historical_data[product]
         hist['timestamps'].append(state.timestamp)
-        hist['spreads'].append(spread)
-
-        # Maintain volatility window
-        spreads = hist['spreads'][-params["volatility_window"]:]
-        if len(spreads) < 2:
+        spreads = hist['spreads']
+        if len(spreads) == spreads.maxlen:
+            evicted = spreads[0]
+            hist['spread_sum'] -= evicted
+            hist['spread_sumsq'] -= evicted * evicted
+        spreads.append(spread)
+        hist['spread_sum'] += spread
+        hist['spread_sumsq'] += spread * spread
+
+        # Window statistics from the running sums
+        n = len(spreads)
+        if n < 2:
             return orders
 
-        spread_mean = np.mean(spreads)
-        spread_std = np.std(spreads)
+        spread_mean = hist['spread_sum'] / n
+        spread_std = math.sqrt(max(hist['spread_sumsq'] / n - spread_mean * spread_mean, 0.0))
 
         if spread_std == 0:
             return orders
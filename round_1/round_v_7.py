@@ -1,39 +1,99 @@
 from datamodel import Order, OrderDepth, TradingState, Symbol
 import json
-import statistics
+import math
+import sys
+import numpy as np
+from itertools import chain
+from operator import attrgetter
 from typing import Any
 
+try:
+    from numba import njit
+except ImportError:
+    # pendulum_signals is then an ordinary function
+    def njit(*args, **kwargs):
+        return lambda fn: fn
+
+
+# Conversion observation and trade fields in the order the visualizer expects
+conversion_fields = attrgetter("bidPrice", "askPrice", "transportFees", "exportTariff",
+                               "importTariff", "sugarPrice", "sunlightIndex")
+trade_fields = attrgetter("symbol", "price", "quantity", "buyer", "seller", "timestamp")
+
+
+@njit("(float64[:], float64[:], int64, int64, float64)", cache=True)
+def pendulum_signals(buf, sums, idx, fill, price):
+    """Write price into the ring at slot idx (fill entries before it) and return (fair, stdev of the last 10,
+    momentum); sums holds the running window total and the last 10's sum and sum of squares"""
+    size = buf.shape[0]
+    if fill == size:
+        sums[0] -= buf[idx]
+    if fill >= 10:
+        old = buf[(idx - 10) % size]
+        sums[1] -= old
+        sums[2] -= old * old
+    buf[idx] = price
+    sums[0] += price
+    sums[1] += price
+    sums[2] += price * price
+    fill = min(fill + 1, size)
+
+    momentum = 0.0
+    if fill >= 3:
+        momentum = price - buf[(idx - 2) % size]
+
+    price_std = 1.0
+    if fill >= 10:
+        price_std = math.sqrt(max(10 * sums[2] - sums[1] * sums[1], 0.0) / 90)
+    return sums[0] / fill, price_std, momentum
+
+
+def compress_trades(trades: dict[Symbol, list[Any]]) -> list[tuple[Any, ...]]:
+    return list(map(trade_fields, chain.from_iterable(trades.values())))
+
+
+def compress_observations(observations: Any) -> list[Any]:
+    conversions = observations.conversionObservations
+    if not conversions:
+        return [observations.plainValueObservations, {}]
+    return [observations.plainValueObservations,
+            {product: conversion_fields(obs) for product, obs in conversions.items()}]
+
+
+def compress_orders(orders: dict[Symbol, list[Order]]) -> list[list[Any]]:
+    return [[o.symbol, o.price, o.quantity] for ol in orders.values() for o in ol]
+
 
 class Logger:
     def __init__(self) -> None:
         self.logs = ""
         self.max_log_length = 3750
+        # Listings are fixed for a session; keyed on their symbols since the dict is rebuilt every tick
+        self.listings_cache = (None, None)
 
     def print(self, *objects: Any, sep: str = " ", end: str = "\n") -> None:
         self.logs += sep.join(map(str, objects)) + end
 
     def flush(self, state: TradingState, orders: dict[Symbol, list[Order]], conversions: int, trader_data: str) -> None:
-        base_length = len(
-            self.to_json([
-                self.compress_state(state, ""),
-                self.compress_orders(orders),
-                conversions,
-                "",
-                "",
-            ])
-        )
-
-        max_item_length = (self.max_log_length - base_length) // 3
-
-        print(
-            self.to_json([
-                self.compress_state(state, self.truncate(
-                    state.traderData, max_item_length)),
-                self.compress_orders(orders),
-                conversions,
-                self.truncate(trader_data, max_item_length),
-                self.truncate(self.logs, max_item_length),
-            ])
+        # One full serialization; the three strings are spliced into their slots
+        base = self.to_json([
+            self.compress_state(state, ""),
+            compress_orders(orders),
+            conversions,
+            "",
+            "",
+        ])
+        max_item_length = (self.max_log_length - len(base)) // 3
+
+        head = "[[" + str(state.timestamp) + ","
+        # One write per tick; resolved at call time so redirected stdout (backtester capture) still works
+        sys.stdout.write(
+            head
+            + self.to_json(self.truncate(state.traderData, max_item_length))
+            + base[len(head) + 2:-7]
+            + "," + self.to_json(self.truncate(trader_data, max_item_length))
+            + "," + self.to_json(self.truncate(self.logs, max_item_length))
+            + "]\n"
         )
         self.logs = ""
 
@@ -41,24 +101,21 @@ class Logger:
         return [
             state.timestamp,
             trader_data,
-            [[listing.symbol, listing.product, listing.denomination]
-             for listing in state.listings.values()],
+            self.compress_listings(state.listings),
             {symbol: [depth.buy_orders, depth.sell_orders]
              for symbol, depth in state.order_depths.items()},
-            [[t.symbol, t.price, t.quantity, t.buyer, t.seller, t.timestamp]
-             for trades in state.own_trades.values() for t in trades],
-            [[t.symbol, t.price, t.quantity, t.buyer, t.seller, t.timestamp]
-             for trades in state.market_trades.values() for t in trades],
+            compress_trades(state.own_trades),
+            compress_trades(state.market_trades),
             state.position,
-            [state.observations.plainValueObservations, {
-                k: [v.bidPrice, v.askPrice, v.transportFees, v.exportTariff,
-                    v.importTariff, v.sugarPrice, v.sunlightIndex]
-                for k, v in state.observations.conversionObservations.items()
-            }],
+            compress_observations(state.observations),
         ]
 
-    def compress_orders(self, orders: dict[Symbol, list[Order]]) -> list[list[Any]]:
-        return [[o.symbol, o.price, o.quantity] for ol in orders.values() for o in ol]
+    def compress_listings(self, listings: dict[Symbol, Any]) -> list[list[Any]]:
+        key = tuple(listings)
+        if key != self.listings_cache[0]:
+            self.listings_cache = (key, [[listing.symbol, listing.product, listing.denomination]
+                                         for listing in listings.values()])
+        return self.listings_cache[1]
 
     def to_json(self, value: Any) -> str:
         return json.dumps(value, separators=(",", ":"))
@@ -72,8 +129,10 @@ logger = Logger()
 
 class Trader:
     def __init__(self):
-        self.history = {"KELP": [], "SQUID_INK": []}
         self.maxlen = 50
+        # Mid price rings: [buffer, running sums, next write slot, filled count]
+        self.history = {product: [np.empty(self.maxlen, dtype=np.float64), np.zeros(3), 0, 0]
+                        for product in ("KELP", "SQUID_INK")}
         self.tick = 0
 
     def pendulum_strategy(self, product, order_depth, position, limit):
@@ -84,19 +143,11 @@ class Trader:
             best_bid = max(order_depth.buy_orders)
             best_ask = min(order_depth.sell_orders)
             mid_price = (best_bid + best_ask) / 2
-            history.append(mid_price)
-            if len(history) > self.maxlen:
-                history.pop(0)
-
-            momentum = 0
-            if len(history) >= 3:
-                momentum = history[-1] - history[-3]
-
-            price_std = statistics.stdev(
-                history[-10:]) if len(history) >= 10 else 1
+            buf, sums, idx, fill = history
+            fair, price_std, momentum = pendulum_signals(buf, sums, idx, fill, mid_price)
+            history[2] = (idx + 1) % self.maxlen
+            history[3] = min(fill + 1, self.maxlen)
             edge = max(1, int(price_std * 0.8))
-
-            fair = sum(history) / len(history)
             buy_qty = max(0, limit - position)
             sell_qty = max(0, position + limit)
 
@@ -1,6 +1,7 @@
 from datamodel import OrderDepth, UserId, TradingState, Order
 from typing import List, Dict
-import jsonpickle
+from array import array
+from collections import deque
 import numpy as np
 from statistics import mean
 
@@ -47,6 +48,12 @@ class Trader:
         if params is None:
             params = PARAMS
         self.params = params
+        self.resin_params = params[Product.RAINFOREST_RESIN]
+        self.kelp_params = params[Product.KELP]
+        self.squid_params = params[Product.SQUID_INK]
+        self.kelp_beta = self.kelp_params["reversion_beta"]
+        self.kelp_take_width = self.kelp_params["take_width"]
+        self.kelp_min_edge = self.kelp_params["min_edge"]
 
         self.LIMIT = {
             Product.RAINFOREST_RESIN: 50,
@@ -55,65 +62,77 @@ class Trader:
         }
 
         self.squid_data = {
-            "edge": self.params[Product.SQUID_INK]["init_edge"],
-            "volume_history": [],
-            "price_history": []
+            "edge": self.squid_params["init_edge"],
+            "volume_history": deque(maxlen=self.squid_params["volume_avg_window"]),
+            "volume_sum": 0,
+            "price_history": deque(maxlen=self.squid_params["window_size"])
         }
 
         self.kelp_data = {
             "fair_value": PARAMS[Product.KELP]["init_fair_value"],
-            "price_history": []
+            "price_history": deque(maxlen=self.kelp_params["window_size"])
         }
 
-    def take_best_orders(self, product, fair_value, take_width, orders, order_depth, position):
+    def take_best_orders(self, product, fair_value, take_width, prices, quantities, order_depth, best_bid, best_ask,
+                         position):
         buy_vol = 0
         sell_vol = 0
         position_limit = self.LIMIT[product]
 
-        if order_depth.sell_orders:
-            best_ask = min(order_depth.sell_orders.keys())
+        if best_ask is not None:
             if best_ask <= fair_value - take_width:
                 quantity = min(-order_depth.sell_orders[best_ask],
                                position_limit - position)
                 if quantity > 0:
-                    orders.append(Order(product, best_ask, quantity))
+                    prices.append(best_ask)
+                    quantities.append(quantity)
                     buy_vol += quantity
 
-        if order_depth.buy_orders:
-            best_bid = max(order_depth.buy_orders.keys())
+        if best_bid is not None:
             if best_bid >= fair_value + take_width:
                 quantity = min(
                     order_depth.buy_orders[best_bid], position_limit + position)
                 if quantity > 0:
-                    orders.append(Order(product, best_bid, -quantity))
+                    prices.append(best_bid)
+                    quantities.append(-quantity)
                     sell_vol += quantity
 
         return buy_vol, sell_vol
 
-    def market_make(self, product, orders, bid, ask, position, buy_vol, sell_vol):
+    def market_make(self, product, prices, quantities, bid, ask, position, buy_vol, sell_vol):
         pos_limit = self.LIMIT[product]
 
         available_buy = pos_limit - (position + buy_vol)
         if available_buy > 0:
-            orders.append(Order(product, round(bid), available_buy))
+            prices.append(round(bid))
+            quantities.append(available_buy)
 
         available_sell = pos_limit + (position - sell_vol)
         if available_sell > 0:
-            orders.append(Order(product, round(ask), -available_sell))
+            prices.append(round(ask))
+            quantities.append(-available_sell)
 
         return buy_vol, sell_vol
 
+    def materialize(self, product, prices, quantities):
+        return [Order(product, price, quantity) for price, quantity in zip(prices, quantities)]
+
     # Rainforest Resin Strategy
     def resin_strategy(self, order_depth, position):
-        params = self.params[Product.RAINFOREST_RESIN]
-        orders = []
+        params = self.resin_params
+        prices, quantities = array('i'), array('i')
+        best_bid = max(order_depth.buy_orders, default=None)
+        best_ask = min(order_depth.sell_orders, default=None)
 
         buy_vol, sell_vol = self.take_best_orders(
             Product.RAINFOREST_RESIN,
             params["fair_value"],
             params["take_width"],
-            orders,
+            prices,
+            quantities,
             order_depth,
+            best_bid,
+            best_ask,
             position
         )
 
@@ -121,78 +140,79 @@ class Trader:
         bid = params["fair_value"] - spread//2
         ask = params["fair_value"] + spread//2
 
-        self.market_make(Product.RAINFOREST_RESIN, orders,
+        self.market_make(Product.RAINFOREST_RESIN, prices, quantities,
                          bid, ask, position, buy_vol, sell_vol)
-        return orders
+        return prices, quantities
 
     # Kelp Strategy
-    def kelp_fair_value(self, order_depth):
-        if order_depth.sell_orders and order_depth.buy_orders:
-            best_ask = min(order_depth.sell_orders.keys())
-            best_bid = max(order_depth.buy_orders.keys())
+    def kelp_fair_value(self, best_bid, best_ask):
+        if best_ask is not None and best_bid is not None:
             mid_price = (best_ask + best_bid) / 2
-            self.kelp_data["price_history"].append(mid_price)
-
-            if len(self.kelp_data["price_history"]) > self.params[Product.KELP]["window_size"]:
-                self.kelp_data["price_history"].pop(0)
+            price_history = self.kelp_data["price_history"]
+            price_history.append(mid_price)
 
-            if len(self.kelp_data["price_history"]) >= 2:
-                last_price = self.kelp_data["price_history"][-2]
+            if len(price_history) >= 2:
+                last_price = price_history[-2]
                 returns = (mid_price - last_price) / last_price
-                pred_returns = returns * \
-                    self.params[Product.KELP]["reversion_beta"]
-                return mid_price + (mid_price * pred_returns)
+                return mid_price * (1 + returns * self.kelp_beta)
 
         return self.kelp_data["fair_value"]
 
     def kelp_strategy(self, order_depth, position):
-        params = self.params[Product.KELP]
-        orders = []
-        fair_value = self.kelp_fair_value(order_depth)
+        prices, quantities = array('i'), array('i')
+        best_bid = max(order_depth.buy_orders, default=None)
+        best_ask = min(order_depth.sell_orders, default=None)
+        fair_value = self.kelp_fair_value(best_bid, best_ask)
 
         buy_vol, sell_vol = self.take_best_orders(
             Product.KELP,
             fair_value,
-            params["take_width"],
-            orders,
+            self.kelp_take_width,
+            prices,
+            quantities,
             order_depth,
+            best_bid,
+            best_ask,
             position
         )
 
-        spread = params["min_edge"] * 2
-        bid = fair_value - params["min_edge"]
-        ask = fair_value + params["min_edge"]
+        bid = fair_value - self.kelp_min_edge
+        ask = fair_value + self.kelp_min_edge
 
-        self.market_make(Product.KELP, orders, bid, ask,
+        self.market_make(Product.KELP, prices, quantities, bid, ask,
                          position, buy_vol, sell_vol)
-        return orders
+        return prices, quantities
 
     # Squid Ink Strategy
     def update_squid_edge(self, position):
-        self.squid_data["volume_history"].append(abs(position))
-        if len(self.squid_data["volume_history"]) > self.params[Product.SQUID_INK]["volume_avg_window"]:
-            self.squid_data["volume_history"].pop(0)
-
-        if len(self.squid_data["volume_history"]) == self.params[Product.SQUID_INK]["volume_avg_window"]:
-            avg_volume = mean(self.squid_data["volume_history"])
-
-            if avg_volume >= self.params[Product.SQUID_INK]["volume_bar"]:
-                self.squid_data["edge"] += self.params[Product.SQUID_INK]["edge_step"]
+        params = self.squid_params
+        squid_data = self.squid_data
+        volume_history = squid_data["volume_history"]
+        volume = abs(position)
+        if len(volume_history) == volume_history.maxlen:
+            squid_data["volume_sum"] -= volume_history[0]
+        volume_history.append(volume)
+        squid_data["volume_sum"] += volume
+
+        if len(volume_history) == params["volume_avg_window"]:
+            avg_volume = squid_data["volume_sum"] / params["volume_avg_window"]
+
+            if avg_volume >= params["volume_bar"]:
+                squid_data["edge"] += params["edge_step"]
             else:
-                new_edge = self.squid_data["edge"] * \
-                    self.params[Product.SQUID_INK]["decay_factor"]
-                if new_edge >= self.params[Product.SQUID_INK]["min_edge"]:
-                    self.squid_data["edge"] = new_edge
+                new_edge = squid_data["edge"] * params["decay_factor"]
+                if new_edge >= params["min_edge"]:
+                    squid_data["edge"] = new_edge
 
     def squid_strategy(self, order_depth, position):
-        params = self.params[Product.SQUID_INK]
-        orders = []
+        params = self.squid_params
+        prices, quantities = array('i'), array('i')
 
         self.update_squid_edge(position)
 
-        if order_depth.sell_orders and order_depth.buy_orders:
-            best_ask = min(order_depth.sell_orders.keys())
-            best_bid = max(order_depth.buy_orders.keys())
+        best_bid = max(order_depth.buy_orders, default=None)
+        best_ask = min(order_depth.sell_orders, default=None)
+        if best_ask is not None and best_bid is not None:
             fair_value = (best_ask + best_bid) / 2
         else:
             fair_value = mean(params["price_range"])
@@ -202,8 +222,11 @@ class Trader:
             Product.SQUID_INK,
             fair_value,
             take_width,
-            orders,
+            prices,
+            quantities,
             order_depth,
+            best_bid,
+            best_ask,
             position
         )
 
@@ -213,32 +236,38 @@ class Trader:
         bid = max(bid, params["price_range"][0])
         ask = min(ask, params["price_range"][1])
 
-        self.market_make(Product.SQUID_INK, orders, bid,
+        self.market_make(Product.SQUID_INK, prices, quantities, bid,
                          ask, position, buy_vol, sell_vol)
-        return orders
+        return prices, quantities
 
     def run(self, state: TradingState):
         result = {}
-
-        if Product.RAINFOREST_RESIN in state.order_depths:
-            position = state.position.get(Product.RAINFOREST_RESIN, 0)
-            result[Product.RAINFOREST_RESIN] = self.resin_strategy(
-                state.order_depths[Product.RAINFOREST_RESIN],
+        order_depths = state.order_depths
+        positions = state.position
+        resin, kelp, squid = Product.RAINFOREST_RESIN, Product.KELP, Product.SQUID_INK
+
+        if resin in order_depths:
+            position = positions.get(resin, 0)
+            prices, quantities = self.resin_strategy(
+                order_depths[resin],
                 position
             )
+            result[resin] = self.materialize(resin, prices, quantities)
 
-        if Product.KELP in state.order_depths:
-            position = state.position.get(Product.KELP, 0)
-            result[Product.KELP] = self.kelp_strategy(
-                state.order_depths[Product.KELP],
+        if kelp in order_depths:
+            position = positions.get(kelp, 0)
+            prices, quantities = self.kelp_strategy(
+                order_depths[kelp],
                 position
             )
+            result[kelp] = self.materialize(kelp, prices, quantities)
 
-        if Product.SQUID_INK in state.order_depths:
-            position = state.position.get(Product.SQUID_INK, 0)
-            result[Product.SQUID_INK] = self.squid_strategy(
-                state.order_depths[Product.SQUID_INK],
+        if squid in order_depths:
+            position = positions.get(squid, 0)
+            prices, quantities = self.squid_strategy(
+                order_depths[squid],
                 position
             )
+            result[squid] = self.materialize(squid, prices, quantities)
 
         return result, 0, ""
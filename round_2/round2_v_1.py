@@ -1,11 +1,28 @@
 import json
+import math
+import sys
 import numpy as np
 import pandas as pd
-import jsonpickle
-from typing import Dict, List, Any
+from collections import deque
+from itertools import chain
+from typing import Dict, List, Optional, Tuple, Any
 from datamodel import Listing, Observation, Order, OrderDepth, ProsperityEncoder, Symbol, Trade, TradingState
 
 
+def encode_trader_data(value: Any) -> str:
+    return json.dumps(value, default=list, separators=(",", ":"))
+
+
+def decode_trader_data(value: str) -> Any:
+    return json.loads(value)
+
+
+def best_prices(order_depths: Dict[Symbol, OrderDepth]) -> Dict[Symbol, Tuple[Optional[int], Optional[int]]]:
+    """(best_bid, best_ask) per symbol in one pass over the books, None for an empty side"""
+    return {symbol: (max(depth.buy_orders, default=None), min(depth.sell_orders, default=None))
+            for symbol, depth in order_depths.items()}
+
+
 class Logger:
     def __init__(self) -> None:
         self.logs = ""
@@ -15,31 +32,25 @@ class Logger:
         self.logs += sep.join(map(str, objects)) + end
 
     def flush(self, state: TradingState, orders: Dict[Symbol, List[Order]], conversions: int, trader_data: str) -> None:
-        base_length = len(
-            self.to_json(
-                [
-                    self.compress_state(state, ""),
-                    self.compress_orders(orders),
-                    conversions,
-                    "",
-                    "",
-                ]
-            )
-        )
-
-        max_item_length = (self.max_log_length - base_length) // 3
-
-        print(
-            self.to_json(
-                [
-                    self.compress_state(state, self.truncate(
-                        state.traderData, max_item_length)),
-                    self.compress_orders(orders),
-                    conversions,
-                    self.truncate(trader_data, max_item_length),
-                    self.truncate(self.logs, max_item_length),
-                ]
-            )
+        # One full serialization; the three strings are spliced into their slots
+        base = self.to_json([
+            self.compress_state(state, ""),
+            self.compress_orders(orders),
+            conversions,
+            "",
+            "",
+        ])
+        max_item_length = (self.max_log_length - len(base)) // 3
+
+        head = "[[" + str(state.timestamp) + ","
+        # One write per tick; resolved at call time so redirected stdout (backtester capture) still works
+        sys.stdout.write(
+            head
+            + self.to_json(self.truncate(state.traderData, max_item_length))
+            + base[len(head) + 2:-7]
+            + "," + self.to_json(self.truncate(trader_data, max_item_length))
+            + "," + self.to_json(self.truncate(self.logs, max_item_length))
+            + "]\n"
         )
 
         self.logs = ""
@@ -64,7 +75,7 @@ class Logger:
 
     def compress_trades(self, trades: Dict[Symbol, List[Trade]]) -> List[List[Any]]:
         return [[trade.symbol, trade.price, trade.quantity, trade.buyer, trade.seller, trade.timestamp]
-                for arr in trades.values() for trade in arr]
+                for trade in chain.from_iterable(trades.values())]
 
     def compress_observations(self, observations: Observation) -> List[Any]:
         return [observations.plainValueObservations, {
@@ -80,7 +91,7 @@ class Logger:
         }]
 
     def compress_orders(self, orders: Dict[Symbol, List[Order]]) -> List[List[Any]]:
-        return [[order.symbol, order.price, order.quantity] for arr in orders.values() for order in arr]
+        return [[order.symbol, order.price, order.quantity] for order in chain.from_iterable(orders.values())]
 
     def to_json(self, value: Any) -> str:
         return json.dumps(value, cls=ProsperityEncoder, separators=(",", ":"))
@@ -155,29 +166,35 @@ class Trader:
 
         }
 
+        kelp_window = StrategyParams.KELP["window_size"]
+        squid_window = StrategyParams.SQUID["volatility_window"]
+        spread_window = StrategyParams.PICNIC["spread_window"]
         self.historical_data = {
-            Product.KELP: {'timestamps': [], 'mid_prices': []},
-            Product.SQUID_INK: {'timestamps': [], 'spreads': []},
-            Product.PICNIC_BASKET1: {'spread_history': []},
-            Product.PICNIC_BASKET2: {'spread_history': []}
+            Product.KELP: {'mid_prices': deque(maxlen=kelp_window)},
+            Product.SQUID_INK: {'spreads': deque(maxlen=squid_window)},
+            Product.PICNIC_BASKET1: {'spread_history': deque(maxlen=spread_window),
+                                     'spread_sum': 0.0, 'spread_sumsq': 0.0},
+            Product.PICNIC_BASKET2: {'spread_history': deque(maxlen=spread_window),
+                                     'spread_sum': 0.0, 'spread_sumsq': 0.0}
         }
 
     def run(self, state: TradingState):
         result = {}
-        trader_data = jsonpickle.decode(
-            state.traderData) if state.traderData else {}
+        trader_data = decode_trader_data(state.traderData) if state.traderData else {}
 
         try:
+            bests = best_prices(state.order_depths)
+
             # Existing strategies
             if Product.RAINFOREST_RESIN in state.order_depths:
-                result[Product.RAINFOREST_RESIN] = self.trade_resin(state)
+                result[Product.RAINFOREST_RESIN] = self.trade_resin(state, bests)
             if Product.KELP in state.order_depths:
-                result[Product.KELP] = self.trade_kelp(state, trader_data)
+                result[Product.KELP] = self.trade_kelp(state, trader_data, bests)
             if Product.SQUID_INK in state.order_depths:
-                result[Product.SQUID_INK] = self.trade_squid(state)
+                result[Product.SQUID_INK] = self.trade_squid(state, bests)
 
             # New Picnic Basket strategies
-            result.update(self.trade_picnic_baskets(state, trader_data))
+            result.update(self.trade_picnic_baskets(state, trader_data, bests))
 
             # Update trader_data with historical data
             trader_data['historical_data'] = self.historical_data
@@ -185,12 +202,17 @@ class Trader:
         except Exception as e:
             logger.print(f"Error: {str(e)}")
 
-        logger.flush(state, result, 0, jsonpickle.encode(trader_data))
-        return result, 0, jsonpickle.encode(trader_data)
+        trader_data_str = encode_trader_data(trader_data)
+        logger.flush(state, result, 0, trader_data_str)
+        return result, 0, trader_data_str
 
-    def trade_picnic_baskets(self, state: TradingState, trader_data: dict) -> Dict[str, List[Order]]:
+    def trade_picnic_baskets(self, state: TradingState, trader_data: dict,
+                             bests: Dict[Symbol, Tuple[Optional[int], Optional[int]]]) -> Dict[str, List[Order]]:
         orders = {}
         params = StrategyParams.PICNIC
+        # Two-sided mids, computed once and shared by both baskets
+        mids = {symbol: (best_ask + best_bid) / 2 for symbol, (best_bid, best_ask) in bests.items()
+                if best_bid is not None and best_ask is not None}
 
         # Process both picnic baskets
         for basket, components in [(Product.PICNIC_BASKET1, params["basket1_components"]),
@@ -205,31 +227,38 @@ class Trader:
                                    for product in components.keys()}
 
             # Calculate synthetic price
-            synthetic_price = self.calculate_synthetic_price(
-                state.order_depths, components)
-            basket_price = self.get_mid_price(state.order_depths[basket])
+            synthetic_price = self.calculate_synthetic_price(mids, components)
+            basket_price = mids.get(basket)
 
             if synthetic_price is None or basket_price is None:
                 continue
 
             spread = basket_price - synthetic_price
 
-            # Update spread history
-            spread_history = self.historical_data[basket]['spread_history']
+            # Update spread history and its running sums
+            hist = self.historical_data[basket]
+            spread_history = hist['spread_history']
+            if len(spread_history) == spread_history.maxlen:
+                evicted = spread_history[0]
+                hist['spread_sum'] -= evicted
+                hist['spread_sumsq'] -= evicted * evicted
             spread_history.append(spread)
-            if len(spread_history) > params["spread_window"]:
-                spread_history.pop(0)
+            hist['spread_sum'] += spread
+            hist['spread_sumsq'] += spread * spread
 
             # Calculate z-score
-            if len(spread_history) >= params["spread_window"]:
-                spread_mean = np.mean(spread_history)
-                spread_std = np.std(spread_history)
+            n = len(spread_history)
+            if n >= params["spread_window"]:
+                spread_mean = hist['spread_sum'] / n
+                spread_std = math.sqrt(max(hist['spread_sumsq'] / n - spread_mean * spread_mean, 0.0))
+                if spread_std == 0:
+                    continue
                 zscore = (spread - spread_mean) / spread_std
 
                 # Generate orders if beyond threshold
                 if abs(zscore) > params["zscore_threshold"]:
                     basket_orders, component_orders = self.generate_arb_orders(
-                        state, basket, components, basket_pos, spread, zscore, params
+                        state, bests, basket, components, basket_pos, spread, zscore, params
                     )
 
                     if basket_orders:
@@ -241,20 +270,14 @@ class Trader:
 
         return orders
 
-    def calculate_synthetic_price(self, order_depths: Dict[str, OrderDepth], components: Dict[str, int]) -> float:
-        synthetic = 0
-        for product, quantity in components.items():
-            if product not in order_depths:
-                return None
-            depth = order_depths[product]
-            if not depth.buy_orders or not depth.sell_orders:
-                return None
-            best_bid = max(depth.buy_orders.keys())
-            best_ask = min(depth.sell_orders.keys())
-            synthetic += (best_bid + best_ask) / 2 * quantity
-        return synthetic
-
-    def generate_arb_orders(self, state: TradingState, basket: str, components: Dict[str, int],
+    def calculate_synthetic_price(self, mids: Dict[Symbol, float], components: Dict[str, int]) -> float:
+        # One subset check on the key views replaces a per-component missing-side branch
+        if not mids.keys() >= components.keys():
+            return None
+        return sum(mids[product] * quantity for product, quantity in components.items())
+
+    def generate_arb_orders(self, state: TradingState, bests: Dict[Symbol, Tuple[Optional[int], Optional[int]]],
+                            basket: str, components: Dict[str, int],
                             position: int, spread: float, zscore: float, params: dict):
         basket_orders = []
         component_orders = {}
@@ -262,15 +285,14 @@ class Trader:
         # Determine trade direction
         if zscore > params["zscore_threshold"]:
             # Sell basket, buy components
-            best_bid = max(state.order_depths[basket].buy_orders.keys())
+            best_bid = bests[basket][0]
             qty = min(params["max_order_size"],
                       self.position_limits[basket] + position)
             basket_orders.append(Order(basket, best_bid, -qty))
 
             # Buy components
             for product, quantity in components.items():
-                depth = state.order_depths[product]
-                best_ask = min(depth.sell_orders.keys())
+                best_ask = bests[product][1]
                 comp_qty = quantity * qty
                 comp_qty = min(
                     comp_qty, self.position_limits[product] - state.position.get(product, 0))
@@ -282,15 +304,14 @@ class Trader:
 
         elif zscore < -params["zscore_threshold"]:
             # Buy basket, sell components
-            best_ask = min(state.order_depths[basket].sell_orders.keys())
+            best_ask = bests[basket][1]
             qty = min(params["max_order_size"],
                       self.position_limits[basket] - position)
             basket_orders.append(Order(basket, best_ask, qty))
 
             # Sell components
             for product, quantity in components.items():
-                depth = state.order_depths[product]
-                best_bid = max(depth.buy_orders.keys())
+                best_bid = bests[product][0]
                 comp_qty = quantity * qty
                 comp_qty = min(
                     comp_qty, self.position_limits[product] + state.position.get(product, 0))
@@ -303,18 +324,18 @@ class Trader:
         return basket_orders, component_orders
 
     # Existing strategies remain unchanged below
-    def trade_resin(self, state: TradingState) -> List[Order]:
+    def trade_resin(self, state: TradingState, bests: Dict[Symbol, Tuple[Optional[int], Optional[int]]]) -> List[Order]:
         params = StrategyParams.RESIN
         product = Product.RAINFOREST_RESIN
         position = state.position.get(product, 0)
         orders = []
-        order_depth = state.order_depths[product]
 
-        # Get best bids/asks safely
-        bids = order_depth.buy_orders.keys()
-        asks = order_depth.sell_orders.keys()
-        best_bid = max(bids) if bids else params["fair_value"] - 2
-        best_ask = min(asks) if asks else params["fair_value"] + 2
+        # Fall back to a band around fair value for an empty side
+        best_bid, best_ask = bests[product]
+        if best_bid is None:
+            best_bid = params["fair_value"] - 2
+        if best_ask is None:
+            best_ask = params["fair_value"] + 2
 
         for i in range(3):
             bid_price = params["fair_value"] - params["take_width"] - i
@@ -330,33 +351,24 @@ class Trader:
 
         return orders
 
-    def trade_kelp(self, state: TradingState, trader_data: dict) -> List[Order]:
+    def trade_kelp(self, state: TradingState, trader_data: dict,
+                   bests: Dict[Symbol, Tuple[Optional[int], Optional[int]]]) -> List[Order]:
         params = StrategyParams.KELP
         product = Product.KELP
         position = state.position.get(product, 0)
         orders = []
-        order_depth = state.order_depths[product]
 
         # Safe price calculation
-        bids = order_depth.buy_orders.keys()
-        asks = order_depth.sell_orders.keys()
-        if not bids or not asks:
+        best_bid, best_ask = bests[product]
+        if best_bid is None or best_ask is None:
             return orders
 
-        best_ask = min(asks)
-        best_bid = max(bids)
         mid_price = (best_ask + best_bid) / 2
 
         # Update history
         hist = self.historical_data[product]
-        hist['timestamps'].append(state.timestamp)
         hist['mid_prices'].append(mid_price)
 
-        # Maintain window size
-        if len(hist['mid_prices']) > params["window_size"]:
-            hist['mid_prices'].pop(0)
-            hist['timestamps'].pop(0)
-
         # Generate orders
         if len(hist['mid_prices']) >= 2:
             last_price = hist['mid_prices'][-2]
@@ -370,23 +382,15 @@ class Trader:
 
         return orders
 
-    def trade_squid(self, state: TradingState) -> List[Order]:
+    def trade_squid(self, state: TradingState, bests: Dict[Symbol, Tuple[Optional[int], Optional[int]]]) -> List[Order]:
         params = StrategyParams.SQUID
         product = Product.SQUID_INK
         position = state.position.get(product, 0)
         orders = []
 
-        # Get pair data safely
-        pair_symbol = params["pair_symbol"]
-        pair_depth = state.order_depths.get(pair_symbol, OrderDepth())
-
-        # Get squid bid
-        squid_bids = state.order_depths[product].buy_orders.keys()
-        squid_bid = max(squid_bids) if squid_bids else 0
-
-        # Get pair ask
-        pair_asks = pair_depth.sell_orders.keys()
-        pair_ask = min(pair_asks) if pair_asks else 0
+        # Squid bid and pair ask, 0 when missing
+        squid_bid = bests[product][0] or 0
+        pair_ask = bests.get(params["pair_symbol"], (None, None))[1] or 0
 
         # Calculate spread
         if squid_bid == 0 or pair_ask == 0:
@@ -396,11 +400,9 @@ class Trader:
 
         # Update historical spread
         hist = self.historical_data[product]
-        hist['timestamps'].append(state.timestamp)
         hist['spreads'].append(spread)
 
-        # Maintain volatility window
-        spreads = hist['spreads'][-params["volatility_window"]:]
+        spreads = hist['spreads']
         if len(spreads) < 2:
             return orders
 
@@ -421,8 +423,3 @@ class Trader:
             orders.append(Order(product, squid_bid + 1, max_size))
 
         return orders
-
-    def get_mid_price(self, order_depth: OrderDepth) -> float:
-        bids = order_depth.buy_orders.keys()
-        asks = order_depth.sell_orders.keys()
-        return (min(asks) + max(bids)) / 2 if bids and asks else None
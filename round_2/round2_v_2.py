@@ -1,8 +1,43 @@
 import math
-from typing import List, Dict, Any
+from typing import List, Dict, Optional, Tuple, Any
 import json
+import sys
+from itertools import chain
+import numpy as np
 from datamodel import Listing, Observation, Order, OrderDepth, ProsperityEncoder, Symbol, Trade, TradingState
 
+try:
+    from numba import njit
+except ImportError:
+    # push_price and window_stats run as plain Python
+    def njit(*args, **kwargs):
+        return lambda fn: fn
+
+
+@njit("(float64[:], float64[:], int64, int64, float64)", cache=True)
+def push_price(buf, sums, idx, fill, price):
+    """Write price into the ring at slot idx (fill entries before it), keeping sums = [sum, sum of squares]"""
+    if fill == buf.shape[0]:
+        old = buf[idx]
+        sums[0] -= old
+        sums[1] -= old * old
+    buf[idx] = price
+    sums[0] += price
+    sums[1] += price * price
+
+
+@njit("(float64[:], int64)", cache=True)
+def window_stats(sums, n):
+    """(mean, population std) of an n-price window from its running sums"""
+    var = (n * sums[1] - sums[0] * sums[0]) / (n * n)
+    return sums[0] / n, math.sqrt(var) if var > 0 else 0.0
+
+
+def best_prices(order_depths: Dict[Symbol, OrderDepth]) -> Dict[Symbol, Tuple[Optional[int], Optional[int]]]:
+    """(best_bid, best_ask) per symbol in one pass over the books, None for an empty side"""
+    return {symbol: (max(depth.buy_orders, default=None), min(depth.sell_orders, default=None))
+            for symbol, depth in order_depths.items()}
+
 
 class Logger:
     def __init__(self) -> None:
@@ -13,31 +48,25 @@ class Logger:
         self.logs += sep.join(map(str, objects)) + end
 
     def flush(self, state: TradingState, orders: Dict[Symbol, List[Order]], conversions: int, trader_data: str) -> None:
-        base_length = len(
-            self.to_json(
-                [
-                    self.compress_state(state, ""),
-                    self.compress_orders(orders),
-                    conversions,
-                    "",
-                    "",
-                ]
-            )
-        )
-
-        max_item_length = (self.max_log_length - base_length) // 3
-
-        print(
-            self.to_json(
-                [
-                    self.compress_state(state, self.truncate(
-                        state.traderData, max_item_length)),
-                    self.compress_orders(orders),
-                    conversions,
-                    self.truncate(trader_data, max_item_length),
-                    self.truncate(self.logs, max_item_length),
-                ]
-            )
+        # One full serialization; the three strings are spliced into their slots
+        base = self.to_json([
+            self.compress_state(state, ""),
+            self.compress_orders(orders),
+            conversions,
+            "",
+            "",
+        ])
+        max_item_length = (self.max_log_length - len(base)) // 3
+
+        head = "[[" + str(state.timestamp) + ","
+        # One write per tick; resolved at call time so redirected stdout (backtester capture) still works
+        sys.stdout.write(
+            head
+            + self.to_json(self.truncate(state.traderData, max_item_length))
+            + base[len(head) + 2:-7]
+            + "," + self.to_json(self.truncate(trader_data, max_item_length))
+            + "," + self.to_json(self.truncate(self.logs, max_item_length))
+            + "]\n"
         )
 
         self.logs = ""
@@ -62,7 +91,7 @@ class Logger:
 
     def compress_trades(self, trades: Dict[Symbol, List[Trade]]) -> List[List[Any]]:
         return [[trade.symbol, trade.price, trade.quantity, trade.buyer, trade.seller, trade.timestamp]
-                for arr in trades.values() for trade in arr]
+                for trade in chain.from_iterable(trades.values())]
 
     def compress_observations(self, observations: Observation) -> List[Any]:
         return [observations.plainValueObservations, {
@@ -78,7 +107,7 @@ class Logger:
         }]
 
     def compress_orders(self, orders: Dict[Symbol, List[Order]]) -> List[List[Any]]:
-        return [[order.symbol, order.price, order.quantity] for arr in orders.values() for order in arr]
+        return [[order.symbol, order.price, order.quantity] for order in chain.from_iterable(orders.values())]
 
     def to_json(self, value: Any) -> str:
         return json.dumps(value, cls=ProsperityEncoder, separators=(",", ":"))
@@ -142,20 +171,30 @@ class BlackScholes:
         self.T = T
         self.r = r
         self.sigma = sigma
+        # Only sigma moves during the implied volatility search, so these are computed once
+        self.sqrt_T = math.sqrt(T)
+        self.log_S_over_K = math.log(S / K)
+        self.discount = math.exp(-r * T)
 
     def d1(self):
-        return (math.log(self.S / self.K) + (self.r + 0.5 * self.sigma**2) * self.T) / (self.sigma * math.sqrt(self.T))
+        return (self.log_S_over_K + (self.r + 0.5 * self.sigma**2) * self.T) / (self.sigma * self.sqrt_T)
 
     def d2(self):
-        return self.d1() - self.sigma * math.sqrt(self.T)
+        return self.d1() - self.sigma * self.sqrt_T
 
     def call_price(self):
-        d1, d2 = self.d1(), self.d2()
-        return self.S * self.N(d1) - self.K * math.exp(-self.r * self.T) * self.N(d2)
+        d1 = self.d1()
+        return self.call_from_d(d1, d1 - self.sigma * self.sqrt_T)
 
     def put_price(self):
-        d1, d2 = self.d1(), self.d2()
-        return self.K * math.exp(-self.r * self.T) * self.N(-d2) - self.S * self.N(-d1)
+        d1 = self.d1()
+        return self.put_from_d(d1, d1 - self.sigma * self.sqrt_T)
+
+    def call_from_d(self, d1, d2):
+        return self.S * self.N(d1) - self.K * self.discount * self.N(d2)
+
+    def put_from_d(self, d1, d2):
+        return self.K * self.discount * self.N(-d2) - self.S * self.N(-d1)
 
     def delta(self, option_type='call'):
         d1 = self.d1()
@@ -163,24 +202,41 @@ class BlackScholes:
 
     def gamma(self):
         d1 = self.d1()
-        return self.n(d1) / (self.S * self.sigma * math.sqrt(self.T))
+        return self.n(d1) / (self.S * self.sigma * self.sqrt_T)
 
     def vega(self):
-        d1 = self.d1()
-        return self.S * self.n(d1) * math.sqrt(self.T)
-
-    def implied_volatility(self, option_price, option_type='call', tol=1e-5, max_iter=100):
-        sigma = 0.5
+        return self.vega_from_d1(self.d1())
+
+    def vega_from_d1(self, d1):
+        return self.S * self.n(d1) * self.sqrt_T
+
+    def initial_volatility(self, option_price, option_type='call'):
+        # Corrado-Miller; at the money it reduces to Brenner-Subrahmanyam, sqrt(2 pi / T) * C / S
+        strike = self.K * self.discount
+        # Stated for calls; puts go through put-call parity
+        call = option_price if option_type == 'call' else option_price + self.S - strike
+        half_gap = call - (self.S - strike) / 2
+        root = math.sqrt(max(half_gap * half_gap - (self.S - strike) ** 2 / math.pi, 0.0))
+        sigma = math.sqrt(2 * math.pi / self.T) / (self.S + strike) * (half_gap + root)
+        return sigma if 0 < sigma < 5 else 0.5
+
+    def implied_volatility(self, option_price, option_type='call', tol=1e-5, max_iter=10):
+        price_from_d = self.call_from_d if option_type == 'call' else self.put_from_d
+        sigma = self.initial_volatility(option_price, option_type)
         for _ in range(max_iter):
             self.sigma = sigma
-            price = self.call_price() if option_type == 'call' else self.put_price()
-            vega = self.vega()
+            d1 = self.d1()
+            d2 = d1 - sigma * self.sqrt_T
+            price = price_from_d(d1, d2)
+            vega = self.vega_from_d1(d1)
             if vega == 0:
                 return sigma
             diff = price - option_price
             if abs(diff) < tol:
                 return sigma
-            sigma -= diff / vega
+            # Householder step: the Newton step corrected by the volga term vega * d1 * d2 / sigma
+            step = diff / vega * (1 + 0.5 * diff * d1 * d2 / (sigma * vega))
+            sigma = sigma - step if step < sigma else sigma / 2
         return sigma
 
     def N(self, x):
@@ -209,29 +265,29 @@ class Trader:
 
     def __init__(self):
         self.window = 20
+        # Mid price rings: [buffer, running sums, next write slot, filled count]
         self.price_history = {
-            Product.CROISSANT: [],
-            Product.JAM: [],
-            Product.DJEMBE: [],
+            product: [np.empty(self.window, dtype=np.float64), np.zeros(2), 0, 0]
+            for product in (Product.CROISSANT, Product.JAM, Product.DJEMBE)
         }
 
     def run(self, state: TradingState) -> Dict[str, List[Order]]:
         result = {}
+        bests = best_prices(state.order_depths)
 
         mids = {
-            symbol: self.get_mid_price(
-                state.order_depths.get(symbol, OrderDepth())
-            )
+            symbol: self.get_mid_price(*bests.get(symbol, (None, None)))
             for symbol in self.POSITION_LIMITS
         }
 
         # Update price history
-        for symbol in self.price_history:
+        for symbol, history in self.price_history.items():
             mid = mids.get(symbol)
             if mid:
-                self.price_history[symbol].append(mid)
-                if len(self.price_history[symbol]) > self.window:
-                    self.price_history[symbol].pop(0)
+                buf, sums, idx, fill = history
+                push_price(buf, sums, idx, fill, mid)
+                history[2] = (idx + 1) % self.window
+                history[3] = min(fill + 1, self.window)
 
         # --- Basket Fair Values ---
         fair_basket1 = (
@@ -244,7 +300,7 @@ class Trader:
             + 2 * mids[Product.JAM]
         )
         if Product.RAINFOREST_RESIN in state.order_depths:
-            result[Product.RAINFOREST_RESIN] = self.trade_resin(state)
+            result[Product.RAINFOREST_RESIN] = self.trade_resin(state, bests)
         # --- Basket Market Making ---
         result[Product.PICNIC_BASKET1] = self.market_make(
             Product.PICNIC_BASKET1, fair_basket1, state.order_depths[
@@ -258,11 +314,10 @@ class Trader:
         # --- Individual Strategy: CROISSANT, JAM, DJEMBE ---
         for product in [Product.CROISSANT, Product.JAM, Product.DJEMBE]:
             orders = []
-            if len(self.price_history[product]) >= self.window:
+            _, sums, _, fill = self.price_history[product]
+            if fill >= self.window:
                 mid = mids[product]
-                history = self.price_history[product]
-                mean = sum(history) / len(history)
-                std = self.std_dev(history, mean)
+                mean, std = window_stats(sums, fill)
                 z = (mid - mean) / std if std > 0 else 0
 
                 lower, upper = self.PRICE_RANGES[product]
@@ -284,18 +339,18 @@ class Trader:
         logger.flush(state, result, 0, "")
         return result, 0, ""
 
-    def trade_resin(self, state: TradingState) -> List[Order]:
+    def trade_resin(self, state: TradingState, bests: Dict[Symbol, Tuple[Optional[int], Optional[int]]]) -> List[Order]:
         params = StrategyParams.RESIN
         product = Product.RAINFOREST_RESIN
         position = state.position.get(product, 0)
         orders = []
-        order_depth = state.order_depths[product]
 
-        # Get best bids/asks safely
-        bids = order_depth.buy_orders.keys()
-        asks = order_depth.sell_orders.keys()
-        best_bid = max(bids) if bids else params["fair_value"] - 2
-        best_ask = min(asks) if asks else params["fair_value"] + 2
+        # Fall back to a band around fair value for an empty side
+        best_bid, best_ask = bests[product]
+        if best_bid is None:
+            best_bid = params["fair_value"] - 2
+        if best_ask is None:
+            best_ask = params["fair_value"] + 2
 
         for i in range(3):
             bid_price = params["fair_value"] - params["take_width"] - i
@@ -311,20 +366,12 @@ class Trader:
 
         return orders
 
-    def std_dev(self, prices, mean):
-        return math.sqrt(sum((p - mean) ** 2 for p in prices) / len(prices))
-
-    def get_mid_price(self, order_depth: OrderDepth) -> float:
-        best_ask = min(order_depth.sell_orders.keys()
-                       ) if order_depth.sell_orders else float('inf')
-        best_bid = max(order_depth.buy_orders.keys()
-                       ) if order_depth.buy_orders else float('-inf')
-
-        if best_ask == float('inf') and best_bid == float('-inf'):
+    def get_mid_price(self, best_bid: Optional[int], best_ask: Optional[int]) -> float:
+        if best_ask is None and best_bid is None:
             return 0
-        elif best_ask == float('inf'):
+        elif best_ask is None:
             return best_bid
-        elif best_bid == float('-inf'):
+        elif best_bid is None:
             return best_ask
         else:
             return (best_bid + best_ask) / 2
@@ -346,6 +393,15 @@ class Trader:
     def take_best_order(self, symbol: str, depth: OrderDepth, is_buy: bool, max_qty: int) -> List[Order]:
         orders = []
         book = depth.sell_orders if is_buy else depth.buy_orders
+        if not book or max_qty <= 0:
+            return orders
+
+        # The touch usually covers max_qty on its own; only sort the book when it has to be walked
+        best = min(book) if is_buy else max(book)
+        if abs(book[best]) >= max_qty:
+            orders.append(Order(symbol, best, max_qty if is_buy else -max_qty))
+            return orders
+
         sorted_book = sorted(book.items()) if is_buy else sorted(
             book.items(), reverse=True)
 
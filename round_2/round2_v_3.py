@@ -1,6 +1,8 @@
 import math
 from typing import List, Dict, Any
 import json
+import sys
+from itertools import chain
 import numpy as np
 from datamodel import Listing, Observation, Order, OrderDepth, ProsperityEncoder, Symbol, Trade, TradingState
 
@@ -14,31 +16,30 @@ class Logger:
         self.logs += sep.join(map(str, objects)) + end
 
     def flush(self, state: TradingState, orders: Dict[Symbol, List[Order]], conversions: int, trader_data: str) -> None:
-        base_length = len(
-            self.to_json(
-                [
-                    self.compress_state(state, ""),
-                    self.compress_orders(orders),
-                    conversions,
-                    "",
-                    "",
-                ]
-            )
+        # Serialize once with empty placeholders; the three variable-length
+        # strings are then spliced in instead of dumping the whole payload twice
+        base = self.to_json(
+            [
+                self.compress_state(state, ""),
+                self.compress_orders(orders),
+                conversions,
+                "",
+                "",
+            ]
         )
+        base_length = len(base)
 
         max_item_length = (self.max_log_length - base_length) // 3
 
-        print(
-            self.to_json(
-                [
-                    self.compress_state(state, self.truncate(
-                        state.traderData, max_item_length)),
-                    self.compress_orders(orders),
-                    conversions,
-                    self.truncate(trader_data, max_item_length),
-                    self.truncate(self.logs, max_item_length),
-                ]
-            )
+        head = "[[" + str(state.timestamp) + ","
+        # One write per tick; resolved at call time so redirected stdout (backtester capture) still works
+        sys.stdout.write(
+            head
+            + self.to_json(self.truncate(state.traderData, max_item_length))
+            + base[len(head) + 2:-7]
+            + "," + self.to_json(self.truncate(trader_data, max_item_length))
+            + "," + self.to_json(self.truncate(self.logs, max_item_length))
+            + "]\n"
         )
 
         self.logs = ""
@@ -63,7 +64,7 @@ class Logger:
 
     def compress_trades(self, trades: Dict[Symbol, List[Trade]]) -> List[List[Any]]:
         return [[trade.symbol, trade.price, trade.quantity, trade.buyer, trade.seller, trade.timestamp]
-                for arr in trades.values() for trade in arr]
+                for trade in chain.from_iterable(trades.values())]
 
     def compress_observations(self, observations: Observation) -> List[Any]:
         return [observations.plainValueObservations, {
@@ -79,7 +80,7 @@ class Logger:
         }]
 
     def compress_orders(self, orders: Dict[Symbol, List[Order]]) -> List[List[Any]]:
-        return [[order.symbol, order.price, order.quantity] for arr in orders.values() for order in arr]
+        return [[order.symbol, order.price, order.quantity] for order in chain.from_iterable(orders.values())]
 
     def to_json(self, value: Any) -> str:
         return json.dumps(value, cls=ProsperityEncoder, separators=(",", ":"))
@@ -143,20 +144,30 @@ class BlackScholes:
         self.T = T
         self.r = r
         self.sigma = sigma
+        # Only sigma moves during the implied volatility search, so these are computed once
+        self.sqrt_T = math.sqrt(T)
+        self.log_S_over_K = math.log(S / K)
+        self.discount = math.exp(-r * T)
 
     def d1(self):
-        return (math.log(self.S / self.K) + (self.r + 0.5 * self.sigma**2) * self.T) / (self.sigma * math.sqrt(self.T))
+        return (self.log_S_over_K + (self.r + 0.5 * self.sigma**2) * self.T) / (self.sigma * self.sqrt_T)
 
     def d2(self):
-        return self.d1() - self.sigma * math.sqrt(self.T)
+        return self.d1() - self.sigma * self.sqrt_T
 
     def call_price(self):
-        d1, d2 = self.d1(), self.d2()
-        return self.S * self.N(d1) - self.K * math.exp(-self.r * self.T) * self.N(d2)
+        d1 = self.d1()
+        return self.call_from_d(d1, d1 - self.sigma * self.sqrt_T)
 
     def put_price(self):
-        d1, d2 = self.d1(), self.d2()
-        return self.K * math.exp(-self.r * self.T) * self.N(-d2) - self.S * self.N(-d1)
+        d1 = self.d1()
+        return self.put_from_d(d1, d1 - self.sigma * self.sqrt_T)
+
+    def call_from_d(self, d1, d2):
+        return self.S * self.N(d1) - self.K * self.discount * self.N(d2)
+
+    def put_from_d(self, d1, d2):
+        return self.K * self.discount * self.N(-d2) - self.S * self.N(-d1)
 
     def delta(self, option_type='call'):
         d1 = self.d1()
@@ -164,24 +175,41 @@ class BlackScholes:
 
     def gamma(self):
         d1 = self.d1()
-        return self.n(d1) / (self.S * self.sigma * math.sqrt(self.T))
+        return self.n(d1) / (self.S * self.sigma * self.sqrt_T)
 
     def vega(self):
-        d1 = self.d1()
-        return self.S * self.n(d1) * math.sqrt(self.T)
-
-    def implied_volatility(self, option_price, option_type='call', tol=1e-5, max_iter=100):
-        sigma = 0.5
+        return self.vega_from_d1(self.d1())
+
+    def vega_from_d1(self, d1):
+        return self.S * self.n(d1) * self.sqrt_T
+
+    def initial_volatility(self, option_price, option_type='call'):
+        # Corrado-Miller; at the money it reduces to Brenner-Subrahmanyam, sqrt(2 pi / T) * C / S
+        strike = self.K * self.discount
+        # Stated for calls; puts go through put-call parity
+        call = option_price if option_type == 'call' else option_price + self.S - strike
+        half_gap = call - (self.S - strike) / 2
+        root = math.sqrt(max(half_gap * half_gap - (self.S - strike) ** 2 / math.pi, 0.0))
+        sigma = math.sqrt(2 * math.pi / self.T) / (self.S + strike) * (half_gap + root)
+        return sigma if 0 < sigma < 5 else 0.5
+
+    def implied_volatility(self, option_price, option_type='call', tol=1e-5, max_iter=10):
+        price_from_d = self.call_from_d if option_type == 'call' else self.put_from_d
+        sigma = self.initial_volatility(option_price, option_type)
         for _ in range(max_iter):
             self.sigma = sigma
-            price = self.call_price() if option_type == 'call' else self.put_price()
-            vega = self.vega()
+            d1 = self.d1()
+            d2 = d1 - sigma * self.sqrt_T
+            price = price_from_d(d1, d2)
+            vega = self.vega_from_d1(d1)
             if vega == 0:
                 return sigma
             diff = price - option_price
             if abs(diff) < tol:
                 return sigma
-            sigma -= diff / vega
+            # Householder step: the Newton step corrected by the volga term vega * d1 * d2 / sigma
+            step = diff / vega * (1 + 0.5 * diff * d1 * d2 / (sigma * vega))
+            sigma = sigma - step if step < sigma else sigma / 2
         return sigma
 
     def N(self, x):
@@ -476,6 +504,15 @@ class Trader:
     def take_best_order(self, symbol: str, depth: OrderDepth, is_buy: bool, max_qty: int) -> List[Order]:
         orders = []
         book = depth.sell_orders if is_buy else depth.buy_orders
+        if not book or max_qty <= 0:
+            return orders
+
+        # The touch usually covers max_qty on its own; only sort the book when it has to be walked
+        best = min(book) if is_buy else max(book)
+        if abs(book[best]) >= max_qty:
+            orders.append(Order(symbol, best, max_qty if is_buy else -max_qty))
+            return orders
+
         sorted_book = sorted(book.items()) if is_buy else sorted(
             book.items(), reverse=True)
 
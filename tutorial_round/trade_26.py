@@ -2,14 +2,16 @@ from datamodel import OrderDepth, TradingState, Order
 from typing import List
 import jsonpickle
 import statistics
+from collections import deque
 
 # this is best for now
 
 
 class Trader:
     def __init__(self):
-        self.kelp_vwap = []
-        self.kelp_prices = []
+        self.kelp_vwap = deque()
+        # Only the last 20 prices feed the volatility check
+        self.kelp_prices = deque(maxlen=20)
         self.tick = 0
 
     def resin_strategy(self, product, order_depth, fair_value, width, position, position_limit) -> List[Order]:
@@ -61,17 +63,15 @@ class Trader:
 
             mid_price = (best_ask + best_bid) / 2
             self.kelp_prices.append(mid_price)
-            if len(self.kelp_prices) > 40:
-                self.kelp_prices.pop(0)
 
             # Dynamic VWAP based on last N trades
             vwap_window = 8 if statistics.stdev(
-                self.kelp_prices[-20:]) > 4 else 16
+                self.kelp_prices) > 4 else 16
             current_vwap = (best_bid * ask_vol + best_ask *
                             bid_vol) // total_vol if total_vol else int(mid_price)
             self.kelp_vwap.append({"vwap": current_vwap, "vol": total_vol})
             if len(self.kelp_vwap) > vwap_window:
-                self.kelp_vwap.pop(0)
+                self.kelp_vwap.popleft()
 
             total_weighted = sum(x["vwap"] * x["vol"] for x in self.kelp_vwap)
             total_vol = sum(x["vol"] for x in self.kelp_vwap)
@@ -139,5 +139,5 @@ class Trader:
                 position_limit=50
             )
 
-        trader_data = {"kelp_vwap": self.kelp_vwap}
+        trader_data = {"kelp_vwap": list(self.kelp_vwap)}
         return result, 1, jsonpickle.encode(trader_data)
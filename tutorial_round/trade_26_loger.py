@@ -1,5 +1,6 @@
 import json
 import statistics
+from collections import deque
 from datamodel import Order, OrderDepth, TradingState, ProsperityEncoder, Symbol
 from typing import List, Dict, Tuple, Any
 
@@ -14,30 +15,24 @@ class Logger:
         self.logs += sep.join(map(str, objects)) + end
 
     def flush(self, state: TradingState, orders: Dict[Symbol, List[Order]], conversions: int, trader_data: str) -> None:
-        base_length = len(
-            self.to_json(
-                [
-                    self.compress_state(state, ""),
-                    self.compress_orders(orders),
-                    conversions,
-                    "",
-                    "",
-                ]
-            )
-        )
-        max_item_length = (self.max_log_length - base_length) // 3
-
+        # One full serialization; the three strings are spliced into their slots
+        base = self.to_json([
+            self.compress_state(state, ""),
+            self.compress_orders(orders),
+            conversions,
+            "",
+            "",
+        ])
+        max_item_length = (self.max_log_length - len(base)) // 3
+
+        head = "[[" + str(state.timestamp) + ","
         print(
-            self.to_json(
-                [
-                    self.compress_state(state, self.truncate(
-                        state.traderData, max_item_length)),
-                    self.compress_orders(orders),
-                    conversions,
-                    self.truncate(trader_data, max_item_length),
-                    self.truncate(self.logs, max_item_length),
-                ]
-            )
+            head
+            + self.to_json(self.truncate(state.traderData, max_item_length))
+            + base[len(head) + 2:-7]
+            + "," + self.to_json(self.truncate(trader_data, max_item_length))
+            + "," + self.to_json(self.truncate(self.logs, max_item_length))
+            + "]"
         )
 
         self.logs = ""
@@ -100,8 +95,9 @@ logger = Logger()
 # ========== TRADER STRATEGY ==========
 class Trader:
     def __init__(self):
-        self.kelp_vwap = []
-        self.kelp_prices = []
+        self.kelp_vwap = deque()
+        # Only the last 20 prices feed the volatility check
+        self.kelp_prices = deque(maxlen=20)
         self.tick = 0
 
     def resin_strategy(self, product, order_depth, fair_value, width, position, position_limit) -> List[Order]:
@@ -164,17 +160,15 @@ class Trader:
 
             mid_price = (best_ask + best_bid) / 2
             self.kelp_prices.append(mid_price)
-            if len(self.kelp_prices) > 40:
-                self.kelp_prices.pop(0)
 
             vwap_window = 8 if statistics.stdev(
-                self.kelp_prices[-20:]) > 4 else 16
+                self.kelp_prices) > 4 else 16
             current_vwap = (best_bid * ask_vol + best_ask *
                             bid_vol) // total_vol if total_vol else int(mid_price)
             self.kelp_vwap.append(
                 {"vwap": int(current_vwap), "vol": int(total_vol)})
             if len(self.kelp_vwap) > vwap_window:
-                self.kelp_vwap.pop(0)
+                self.kelp_vwap.popleft()
 
             total_weighted = sum(x["vwap"] * x["vol"] for x in self.kelp_vwap)
             total_vol = sum(x["vol"] for x in self.kelp_vwap)
@@ -251,7 +245,7 @@ class Trader:
             )
 
         # ✅ Safe serialization of trader data
-        trader_data = {"kelp_vwap": self.kelp_vwap}
+        trader_data = {"kelp_vwap": list(self.kelp_vwap)}
         trader_data_str = json.dumps(trader_data, cls=ProsperityEncoder)
 
         logger.flush(state, result, conversions=1, trader_data=trader_data_str)
@@ -2,13 +2,14 @@ from datamodel import OrderDepth, TradingState, Order
 from typing import List
 import jsonpickle
 import statistics
+from collections import deque
 
 
 class Trader:
     def __init__(self):
-        self.kelp_prices = []
-        self.tick = 0
         self.max_history = 20  # for z-score window
+        self.kelp_prices = deque(maxlen=self.max_history)
+        self.tick = 0
 
     def resin_strategy(self, product, order_depth, fair_value, width, position, position_limit) -> List[Order]:
         orders = []
@@ -55,9 +56,6 @@ class Trader:
             mid_price = (best_ask + best_bid) / 2
             self.kelp_prices.append(mid_price)
 
-            if len(self.kelp_prices) > self.max_history:
-                self.kelp_prices.pop(0)
-
             if len(self.kelp_prices) >= self.max_history:
                 mean = statistics.mean(self.kelp_prices)
                 std = statistics.stdev(self.kelp_prices)
@@ -119,5 +117,5 @@ class Trader:
                 z_exit=0.3
             )
 
-        trader_data = {"kelp_prices": self.kelp_prices}
+        trader_data = {"kelp_prices": list(self.kelp_prices)}
         return result, 1, jsonpickle.encode(trader_data)